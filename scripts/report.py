@@ -0,0 +1,17 @@
+import io
+import sys
+from contextlib import redirect_stdout
+
+
+def run_buffered(test_fn) -> None:
+    """
+    Runs a report-style test script, writing its output in one go instead
+    of one write per print(). Whatever was printed is still written if the
+    test raises, ahead of the traceback.
+    """
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            test_fn()
+    finally:
+        sys.stdout.write(buf.getvalue())
@@ -1,7 +1,11 @@
+import argparse
 import random
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+from typing import NamedTuple, Optional
 
-from sqlmodel import Session, select
+from sqlmodel import Session, insert, select, text
 
 from src import (
     BucketScope,
@@ -15,10 +19,34 @@ from src import (
     create_db_and_tables,
     engine,
 )
+from src.categories import load_categories
+from src.logic.rewards import FALLBACK_CATEGORIES
 
 # --- CONFIGURATION ---
 NUM_TRANSACTIONS = 100  # 🚀 Change this to generate more/less data!
 DAYS_HISTORY = 60  # How far back to go
+BATCH_SIZE = 10_000  # Rows generated + committed per round (caps peak memory)
+SEED = None  # Set an int for reproducible data (e.g. when benchmarking)
+
+# Amounts are lognormal: median ~₹1,500, long right tail for big tickets
+AMOUNT_MU = 7.3  # ln(1500)
+AMOUNT_SIGMA = 1.1
+MIN_AMOUNT, MAX_AMOUNT = 100.0, 80000.0
+# Column order of the generated expense rows (bulk inserted as raw tuples)
+EXPENSE_COLUMNS = (
+    "card_id",
+    "amount",
+    "merchant",
+    "category",
+    "platform",
+    "date",
+    "is_online",
+    "points_earned",
+)
+INSERT_EXPENSE_SQL = (
+    f"INSERT INTO {Expense.__tablename__} ({', '.join(EXPENSE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(EXPENSE_COLUMNS))})"
+)
 
 # --- DATASETS ---
 
@@ -35,6 +63,16 @@ PLATFORMS = [
     "Flipkart App",
 ]
 
+# 40% of transactions go Direct; the rest pick uniformly from PLATFORMS (which
+# includes Direct too). Cumulative weights let one draw + bisect pick a platform.
+DIRECT_BIAS = 0.4
+PLATFORM_CUM_WEIGHTS = tuple(
+    accumulate(
+        (1 - DIRECT_BIAS) / len(PLATFORMS) + (DIRECT_BIAS if p == "Direct" else 0)
+        for p in PLATFORMS
+    )
+)
+
 MERCHANTS_BY_CATEGORY = {
     "Dining": [
         "Starbucks",
@@ -87,1024 +125,697 @@ MERCHANTS_BY_CATEGORY = {
     "Government Services": ["Income Tax", "Passport Seva", "Traffic Challan"],
 }
 
+# Category keys as a tuple, so each draw doesn't rebuild list(dict.keys())
+CATEGORIES = tuple(MERCHANTS_BY_CATEGORY)
+
+# Flat (CSR) view of MERCHANTS_BY_CATEGORY: CATEGORIES[i] owns
+# MERCHANTS[MERCHANT_OFFSETS[i]:MERCHANT_OFFSETS[i + 1]], so a merchant draw
+# is one randrange into a single tuple instead of dict lookup + choice.
+MERCHANTS = tuple(m for ms in MERCHANTS_BY_CATEGORY.values() for m in ms)
+MERCHANT_OFFSETS = tuple(
+    accumulate((len(ms) for ms in MERCHANTS_BY_CATEGORY.values()), initial=0)
+)
+
+# Categories whose transactions are always online (hoisted out of the row loop)
+ONLINE_CATEGORIES = frozenset(
+    {
+        "Travel - Flights",
+        "Travel - Hotels",
+        "Travel - Cabs & Rideshare",
+        "Entertainment",
+        "Telecom & Internet",
+        "Amazon India",  # From specific Merchant rule
+    }
+)
+
 
 # --- CARD DEFINITIONS ---
-def get_card_definitions():
-    """
-    Returns a comprehensive list of credit card setups with realistic reward rules.
+# Plain data, built once at import and inserted as rows by seed().
 
-    Each card includes:
-    - Multiple cap buckets for different reward categories
-    - Varied multipliers (base + bonus) simulating real-world earn rates
-    - min_spend thresholds where applicable
-    - Realistic redemption partners with varying transfer ratios
-    """
-    return [
-        # ==========================================
-        # CARD 1: HDFC Regalia Gold (Premium Travel Card)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="HDFC Regalia Gold",
-                bank="HDFC",
-                network="Mastercard World",
-                monthly_limit=500000.0,
-                billing_cycle_start=15,
-                rewards_currency="Reward Points",
-                base_point_value=0.30,
-                min_spend_per_point=150.0,
-                description="Earns 4 Reward Points per ₹150 spent. 10x on SmartBuy (flights, hotels), 4x on dining, 2x on others. Points worth ₹0.30 each via SmartBuy flights.",
-            ),
-            "buckets": [
-                CapBucket(
-                    name="SmartBuy Monthly Cap",
-                    max_points=4000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-                CapBucket(
-                    name="Dining Bonus Cap",
-                    max_points=2000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-                CapBucket(
-                    name="Global Earnings Cap",
-                    max_points=50000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                    bucket_scope=BucketScope.GLOBAL,
-                ),
-            ],
-            "rules": [
-                # SmartBuy (10x points, capped)
-                {
-                    "category": "Travel - Flights",
-                    "base": 2.0,
-                    "bonus": 8.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Hotels",
-                    "base": 2.0,
-                    "bonus": 8.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 2.0,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                # Dining (4x, separate cap)
-                {
-                    "category": "Dining",
-                    "base": 2.0,
-                    "bonus": 2.0,
-                    "bucket_idx": 1,
-                    "min_spend": 0,
-                },
-                # Base categories (2x)
-                {
-                    "category": "Groceries",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Base Rule (Generic)
-                {
-                    "category": "Base",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions (0x or 1x)
-                {
-                    "category": "Fuel",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Base Rule
-                {
-                    "category": "Base",
-                    "base": 1.0,  # Assumed base earning if not specified
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Utilities",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [
-                {"name": "Singapore Airlines KrisFlyer", "ratio": 2.0, "value": 1.20},
-                {"name": "Marriott Bonvoy", "ratio": 5.0, "value": 0.70},
-                {"name": "InterMiles", "ratio": 1.0, "value": 0.50},
-                {"name": "Accor Live Limitless", "ratio": 2.0, "value": 0.80},
-            ],
+
+class RuleSpec(NamedTuple):
+    """One reward rule; trailing fields default to an uncapped, unconditional rule."""
+
+    category: str
+    base: float
+    bonus: float
+    bucket: Optional[str] = None  # CapBucket name on the same card
+    min_spend: float = 0
+    match_conditions: Optional[dict] = None
+
+
+class BucketSpec(NamedTuple):
+    """One cap bucket; defaults mirror the CapBucket model."""
+
+    name: str
+    max_points: float
+    period: PeriodType = PeriodType.STATEMENT_MONTH
+    cap_type: CapType = CapType.HARD_CAP
+    bucket_scope: BucketScope = BucketScope.CATEGORY
+    reset_anchor_month: int = 1
+
+
+class PartnerSpec(NamedTuple):
+    """One redemption partner."""
+
+    name: str
+    ratio: float
+    value: float
+
+
+# Shared rule tails (everything after the category), reused across cards
+NO_EARN = (0.0, 0.0, None, 0, None)  # Excluded: earns nothing
+FLAT_1X = (1.0, 0.0, None, 0, None)  # Uncapped 1x base, no bonus
+
+CARD_DEFINITIONS = [
+    # ==========================================
+    # CARD 1: HDFC Regalia Gold (Premium Travel Card)
+    # ==========================================
+    {
+        "card": {
+            "name": "HDFC Regalia Gold",
+            "bank": "HDFC",
+            "network": "Mastercard World",
+            "monthly_limit": 500000.0,
+            "billing_cycle_start": 15,
+            "rewards_currency": "Reward Points",
+            "base_point_value": 0.30,
+            "min_spend_per_point": 150.0,
+            "description": "Earns 4 Reward Points per ₹150 spent. 10x on SmartBuy (flights, hotels), 4x on dining, 2x on others. Points worth ₹0.30 each via SmartBuy flights.",
         },
-        # ==========================================
-        # CARD 2: SBI Cashback (Online Shopping King)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="SBI Cashback",
-                bank="SBI",
-                network="Visa Signature",
-                monthly_limit=200000.0,
-                billing_cycle_start=1,
-                rewards_currency="Cashback",
-                base_point_value=1.00,
-                min_spend_per_point=100.0,
-                description="5% cashback on online spends (₹5 per ₹100, capped at ₹5000/month), 1% on offline. Direct statement credit.",
+        "buckets": [
+            BucketSpec("SmartBuy Monthly Cap", 4000.0, PeriodType.STATEMENT_MONTH),
+            BucketSpec("Dining Bonus Cap", 2000.0, PeriodType.STATEMENT_MONTH),
+            BucketSpec(
+                "Global Earnings Cap",
+                50000.0,
+                PeriodType.STATEMENT_MONTH,
+                bucket_scope=BucketScope.GLOBAL,
             ),
-            "buckets": [
-                CapBucket(
-                    name="Online Cashback Cap",
-                    max_points=5000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # 5% on ANY Online Transaction
-                {
-                    "category": "Any",
-                    "base": 5.0,
-                    "bonus": 0.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                    "match_conditions": {"is_online": "true"},
-                },
-                # Base Rule (1%)
-                {
-                    "category": "Base",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Fuel",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Insurance",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [],  # Cashback card - no transfer partners
+        ],
+        "rules": [
+            # SmartBuy (10x points, capped)
+            RuleSpec("Travel - Flights", 2.0, 8.0, "SmartBuy Monthly Cap"),
+            RuleSpec("Travel - Hotels", 2.0, 8.0, "SmartBuy Monthly Cap"),
+            RuleSpec("Shopping", 2.0, 3.0, "SmartBuy Monthly Cap"),
+            # Dining (4x, separate cap)
+            RuleSpec("Dining", 2.0, 2.0, "Dining Bonus Cap"),
+            # Base categories (2x)
+            RuleSpec("Groceries", 2.0, 0.0),
+            RuleSpec("Entertainment", 2.0, 0.0),
+            RuleSpec("Shopping", 2.0, 0.0),
+            # Base Rule (Generic)
+            RuleSpec("Base", *FLAT_1X),
+            # Exclusions (0x or 1x)
+            RuleSpec("Fuel", *FLAT_1X),
+            RuleSpec("Utilities", *FLAT_1X),
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+        ],
+        "partners": [
+            PartnerSpec("Singapore Airlines KrisFlyer", 2.0, 1.20),
+            PartnerSpec("Marriott Bonvoy", 5.0, 0.70),
+            PartnerSpec("InterMiles", 1.0, 0.50),
+            PartnerSpec("Accor Live Limitless", 2.0, 0.80),
+        ],
+    },
+    # ==========================================
+    # CARD 2: SBI Cashback (Online Shopping King)
+    # ==========================================
+    {
+        "card": {
+            "name": "SBI Cashback",
+            "bank": "SBI",
+            "network": "Visa Signature",
+            "monthly_limit": 200000.0,
+            "billing_cycle_start": 1,
+            "rewards_currency": "Cashback",
+            "base_point_value": 1.00,
+            "min_spend_per_point": 100.0,
+            "description": "5% cashback on online spends (₹5 per ₹100, capped at ₹5000/month), 1% on offline. Direct statement credit.",
         },
-        # ==========================================
-        # CARD 3: Axis Ace (Bill Payments & Dining)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="Axis Ace",
-                bank="Axis",
-                network="Visa Signature",
-                monthly_limit=150000.0,
-                billing_cycle_start=10,
-                rewards_currency="Cashback",
-                base_point_value=1.00,
-                min_spend_per_point=100.0,
-                description="5% on bill payments via Google Pay (₹5 per ₹100), 4% on Swiggy/Zomato, 2% elsewhere. Great utility card.",
+        "buckets": [
+            BucketSpec("Online Cashback Cap", 5000.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # 5% on ANY Online Transaction
+            RuleSpec(
+                "Any",
+                5.0,
+                0.0,
+                "Online Cashback Cap",
+                match_conditions={"is_online": "true"},
             ),
-            "buckets": [
-                CapBucket(
-                    name="5% Category Cap",
-                    max_points=500.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-                CapBucket(
-                    name="Dining Cap",
-                    max_points=400.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # 5% on Utilities via GPay (capped)
-                {
-                    "category": "Utilities",
-                    "base": 2.0,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Telecom & Internet",
-                    "base": 2.0,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                # 4% Dining apps (separate cap)
-                {
-                    "category": "Dining",
-                    "base": 2.0,
-                    "bonus": 2.0,
-                    "bucket_idx": 1,
-                    "min_spend": 0,
-                },
-                # 2% Base
-                {
-                    "category": "Shopping",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Flights",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 1% or Less
-                {
-                    "category": "Fuel",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Cabs & Rideshare",
-                    "base": 1.5,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [],
+            # Base Rule (1%)
+            RuleSpec("Base", *FLAT_1X),
+            # Exclusions
+            RuleSpec("Fuel", *NO_EARN),
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+            RuleSpec("Insurance", *NO_EARN),
+        ],
+        "partners": [],  # Cashback card - no transfer partners
+    },
+    # ==========================================
+    # CARD 3: Axis Ace (Bill Payments & Dining)
+    # ==========================================
+    {
+        "card": {
+            "name": "Axis Ace",
+            "bank": "Axis",
+            "network": "Visa Signature",
+            "monthly_limit": 150000.0,
+            "billing_cycle_start": 10,
+            "rewards_currency": "Cashback",
+            "base_point_value": 1.00,
+            "min_spend_per_point": 100.0,
+            "description": "5% on bill payments via Google Pay (₹5 per ₹100), 4% on Swiggy/Zomato, 2% elsewhere. Great utility card.",
         },
-        # ==========================================
-        # CARD 4: Amex Platinum Charge (Ultra Premium)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="Amex Platinum Charge",
-                bank="American Express",
-                network="Amex",
-                monthly_limit=1000000.0,
-                billing_cycle_start=5,
-                rewards_currency="Membership Rewards",
-                base_point_value=0.50,
-                min_spend_per_point=50.0,
-                description="Earns 1 MR point per ₹50 spent. 5x on travel, 3x on dining/entertainment, 2x on shopping. Points worth ₹0.50 each. Transfer to airlines at 1:1.",
-            ),
-            "buckets": [],  # Amex Plat typically has no caps
-            "rules": [
-                # 5x on Travel
-                {
-                    "category": "Travel - Flights",
-                    "base": 1.0,
-                    "bonus": 4.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Hotels",
-                    "base": 1.0,
-                    "bonus": 4.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 3x on Dining & Entertainment
-                {
-                    "category": "Dining",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 2x on Shopping
-                {
-                    "category": "Shopping",
-                    "base": 1.0,
-                    "bonus": 1.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 1x Base
-                {
-                    "category": "Groceries",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Utilities",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Cabs & Rideshare",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Fuel",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Insurance",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Government Services",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [
-                {"name": "British Airways Avios", "ratio": 1.0, "value": 1.50},
-                {"name": "Hilton Honors", "ratio": 2.0, "value": 0.50},
-                {"name": "Air France KLM Flying Blue", "ratio": 1.0, "value": 1.20},
-                {"name": "Delta SkyMiles", "ratio": 1.0, "value": 1.10},
-                {"name": "Emirates Skywards", "ratio": 1.0, "value": 1.00},
-            ],
+        "buckets": [
+            BucketSpec("5% Category Cap", 500.0, PeriodType.STATEMENT_MONTH),
+            BucketSpec("Dining Cap", 400.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # 5% on Utilities via GPay (capped)
+            RuleSpec("Utilities", 2.0, 3.0, "5% Category Cap"),
+            RuleSpec("Telecom & Internet", 2.0, 3.0, "5% Category Cap"),
+            # 4% Dining apps (separate cap)
+            RuleSpec("Dining", 2.0, 2.0, "Dining Cap"),
+            # 2% Base
+            RuleSpec("Shopping", 2.0, 0.0),
+            RuleSpec("Travel - Flights", 2.0, 0.0),
+            RuleSpec("Groceries", 2.0, 0.0),
+            # 1% or Less
+            RuleSpec("Fuel", *FLAT_1X),
+            RuleSpec("Travel - Cabs & Rideshare", 1.5, 0.0),
+            # Exclusions
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+        ],
+        "partners": [],
+    },
+    # ==========================================
+    # CARD 4: Amex Platinum Charge (Ultra Premium)
+    # ==========================================
+    {
+        "card": {
+            "name": "Amex Platinum Charge",
+            "bank": "American Express",
+            "network": "Amex",
+            "monthly_limit": 1000000.0,
+            "billing_cycle_start": 5,
+            "rewards_currency": "Membership Rewards",
+            "base_point_value": 0.50,
+            "min_spend_per_point": 50.0,
+            "description": "Earns 1 MR point per ₹50 spent. 5x on travel, 3x on dining/entertainment, 2x on shopping. Points worth ₹0.50 each. Transfer to airlines at 1:1.",
         },
-        # ==========================================
-        # CARD 5: ICICI Amazon Pay (E-commerce Focused)
-        # ==========================================
-        # ==========================================
-        # CARD 5a: ICICI Amazon Pay (Prime Member)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="ICICI Amazon Pay (Prime)",
-                bank="ICICI",
-                network="Visa Signature",
-                monthly_limit=300000.0,
-                billing_cycle_start=20,
-                rewards_currency="Amazon Pay Balance",
-                base_point_value=1.00,
-                min_spend_per_point=100.0,
-                description="5% back on Amazon.in for Prime members (₹5 per ₹100, capped), 2% on bill payments, 1% elsewhere. Rewards as Amazon Pay balance.",
-                tier_status={"membership": "prime"},
-            ),
-            "buckets": [
-                CapBucket(
-                    name="Amazon Prime Cap",
-                    max_points=2500.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # 5% on Amazon (Prime members only): 1% base + 4% bonus
-                {
-                    "category": "Amazon India",
-                    "base": 1.0,
-                    "bonus": 4.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                    "match_conditions": {"membership": "prime"},
-                },
-                # 2% on Bill Payments
-                {
-                    "category": "Utilities",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Telecom & Internet",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 1% elsewhere
-                {
-                    "category": "Dining",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Flights",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Fuel",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [],
+        "buckets": [],  # Amex Plat typically has no caps
+        "rules": [
+            # 5x on Travel
+            RuleSpec("Travel - Flights", 1.0, 4.0),
+            RuleSpec("Travel - Hotels", 1.0, 4.0),
+            # 3x on Dining & Entertainment
+            RuleSpec("Dining", 1.0, 2.0),
+            RuleSpec("Entertainment", 1.0, 2.0),
+            # 2x on Shopping
+            RuleSpec("Shopping", 1.0, 1.0),
+            # 1x Base
+            RuleSpec("Groceries", *FLAT_1X),
+            RuleSpec("Utilities", *FLAT_1X),
+            RuleSpec("Travel - Cabs & Rideshare", *FLAT_1X),
+            RuleSpec("Fuel", *FLAT_1X),
+            # Exclusions
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Insurance", *NO_EARN),
+            RuleSpec("Government Services", *NO_EARN),
+        ],
+        "partners": [
+            PartnerSpec("British Airways Avios", 1.0, 1.50),
+            PartnerSpec("Hilton Honors", 2.0, 0.50),
+            PartnerSpec("Air France KLM Flying Blue", 1.0, 1.20),
+            PartnerSpec("Delta SkyMiles", 1.0, 1.10),
+            PartnerSpec("Emirates Skywards", 1.0, 1.00),
+        ],
+    },
+    # ==========================================
+    # CARD 5: ICICI Amazon Pay (E-commerce Focused)
+    # ==========================================
+    # ==========================================
+    # CARD 5a: ICICI Amazon Pay (Prime Member)
+    # ==========================================
+    {
+        "card": {
+            "name": "ICICI Amazon Pay (Prime)",
+            "bank": "ICICI",
+            "network": "Visa Signature",
+            "monthly_limit": 300000.0,
+            "billing_cycle_start": 20,
+            "rewards_currency": "Amazon Pay Balance",
+            "base_point_value": 1.00,
+            "min_spend_per_point": 100.0,
+            "description": "5% back on Amazon.in for Prime members (₹5 per ₹100, capped), 2% on bill payments, 1% elsewhere. Rewards as Amazon Pay balance.",
+            "tier_status": {"membership": "prime"},
         },
-        # ==========================================
-        # CARD 5b: ICICI Amazon Pay (Non-Prime Member)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="ICICI Amazon Pay (Non-Prime)",
-                bank="ICICI",
-                network="Visa Signature",
-                monthly_limit=150000.0,
-                billing_cycle_start=20,
-                rewards_currency="Amazon Pay Balance",
-                base_point_value=1.00,
-                min_spend_per_point=100.0,
-                description="2% back on Amazon.in for non-Prime (₹2 per ₹100), 2% on bill payments, 1% elsewhere.",
-                tier_status={"membership": "non_prime"},
+        "buckets": [
+            BucketSpec("Amazon Prime Cap", 2500.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # 5% on Amazon (Prime members only): 1% base + 4% bonus
+            RuleSpec(
+                "Amazon India",
+                1.0,
+                4.0,
+                "Amazon Prime Cap",
+                match_conditions={"membership": "prime"},
             ),
-            "buckets": [],  # Usually, 3% is uncapped or high cap for non-prime
-            "rules": [
-                # 2% on Amazon (Non-Prime members): 1% base + 1% bonus
-                {
-                    "category": "Amazon India",
-                    "base": 1.0,
-                    "bonus": 1.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                    "match_conditions": {"membership": "non_prime"},
-                },
-                # 2% on Bill Payments
-                {
-                    "category": "Utilities",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Telecom & Internet",
-                    "base": 2.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 1% elsewhere
-                {
-                    "category": "Dining",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Flights",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Fuel",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [],
+            # 2% on Bill Payments
+            RuleSpec("Utilities", 2.0, 0.0),
+            RuleSpec("Telecom & Internet", 2.0, 0.0),
+            # 1% elsewhere
+            RuleSpec("Dining", *FLAT_1X),
+            RuleSpec("Shopping", *FLAT_1X),
+            RuleSpec("Travel - Flights", *FLAT_1X),
+            RuleSpec("Groceries", *FLAT_1X),
+            RuleSpec("Entertainment", *FLAT_1X),
+            # Exclusions
+            RuleSpec("Fuel", *NO_EARN),
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+        ],
+        "partners": [],
+    },
+    # ==========================================
+    # CARD 5b: ICICI Amazon Pay (Non-Prime Member)
+    # ==========================================
+    {
+        "card": {
+            "name": "ICICI Amazon Pay (Non-Prime)",
+            "bank": "ICICI",
+            "network": "Visa Signature",
+            "monthly_limit": 150000.0,
+            "billing_cycle_start": 20,
+            "rewards_currency": "Amazon Pay Balance",
+            "base_point_value": 1.00,
+            "min_spend_per_point": 100.0,
+            "description": "2% back on Amazon.in for non-Prime (₹2 per ₹100), 2% on bill payments, 1% elsewhere.",
+            "tier_status": {"membership": "non_prime"},
         },
-        # ==========================================
-        # CARD 6: HDFC Infinia (Super Premium Points Card)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="HDFC Infinia",
-                bank="HDFC",
-                network="Visa Infinite",
-                monthly_limit=2000000.0,
-                billing_cycle_start=8,
-                rewards_currency="Reward Points",
-                base_point_value=0.50,
-                min_spend_per_point=150.0,
-                description="Earns 5 Reward Points per ₹150 spent. 10x on SmartBuy, 5x on all spends. Points worth ₹0.50 each. Invite-only card.",
+        "buckets": [],  # Usually, 3% is uncapped or high cap for non-prime
+        "rules": [
+            # 2% on Amazon (Non-Prime members): 1% base + 1% bonus
+            RuleSpec(
+                "Amazon India",
+                1.0,
+                1.0,
+                None,
+                match_conditions={"membership": "non_prime"},
             ),
-            "buckets": [
-                CapBucket(
-                    name="SmartBuy Monthly",
-                    max_points=10000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # 10% SmartBuy (33 pts per 150 = 10% cap at 10k)
-                {
-                    "category": "Travel - Flights",
-                    "base": 3.3,
-                    "bonus": 7.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Hotels",
-                    "base": 3.3,
-                    "bonus": 7.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                # 5% Base on all eligible
-                {
-                    "category": "Dining",
-                    "base": 3.3,
-                    "bonus": 1.7,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 3.3,
-                    "bonus": 1.7,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 3.3,
-                    "bonus": 1.7,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 3.3,
-                    "bonus": 1.7,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Cabs & Rideshare",
-                    "base": 3.3,
-                    "bonus": 1.7,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Lower categories
-                {
-                    "category": "Utilities",
-                    "base": 3.3,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Fuel",
-                    "base": 3.3,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Insurance",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [
-                {"name": "Singapore Airlines KrisFlyer", "ratio": 1.0, "value": 1.50},
-                {"name": "Marriott Bonvoy", "ratio": 2.5, "value": 0.80},
-                {"name": "InterMiles", "ratio": 0.5, "value": 1.00},
-                {"name": "Club Vistara", "ratio": 1.0, "value": 1.20},
-                {"name": "British Airways Avios", "ratio": 1.0, "value": 1.30},
-            ],
+            # 2% on Bill Payments
+            RuleSpec("Utilities", 2.0, 0.0),
+            RuleSpec("Telecom & Internet", 2.0, 0.0),
+            # 1% elsewhere
+            RuleSpec("Dining", *FLAT_1X),
+            RuleSpec("Shopping", *FLAT_1X),
+            RuleSpec("Travel - Flights", *FLAT_1X),
+            RuleSpec("Groceries", *FLAT_1X),
+            RuleSpec("Entertainment", *FLAT_1X),
+            # Exclusions
+            RuleSpec("Fuel", *NO_EARN),
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+        ],
+        "partners": [],
+    },
+    # ==========================================
+    # CARD 6: HDFC Infinia (Super Premium Points Card)
+    # ==========================================
+    {
+        "card": {
+            "name": "HDFC Infinia",
+            "bank": "HDFC",
+            "network": "Visa Infinite",
+            "monthly_limit": 2000000.0,
+            "billing_cycle_start": 8,
+            "rewards_currency": "Reward Points",
+            "base_point_value": 0.50,
+            "min_spend_per_point": 150.0,
+            "description": "Earns 5 Reward Points per ₹150 spent. 10x on SmartBuy, 5x on all spends. Points worth ₹0.50 each. Invite-only card.",
         },
-        # ==========================================
-        # CARD 7: AU Small Finance Bank LIT (Customizable)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="AU LIT Credit Card",
-                bank="AU Small Finance",
-                network="Rupay",
-                monthly_limit=100000.0,
-                billing_cycle_start=12,
-                rewards_currency="Cashback",
-                base_point_value=1.00,
-                min_spend_per_point=100.0,
-                description="Pick 3 categories for 3.5% cashback (₹3.5 per ₹100, capped at ₹750/month), 0.5% on rest. No annual fee.",
-            ),
-            "buckets": [
-                CapBucket(
-                    name="Selected Category Cap",
-                    max_points=750.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # User-selected 3 categories at 3.5% (assuming common choices)
-                {
-                    "category": "Dining",
-                    "base": 0.5,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 0.5,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 0.5,
-                    "bonus": 3.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                # 0.5% on everything else
-                {
-                    "category": "Shopping",
-                    "base": 0.5,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Flights",
-                    "base": 0.5,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Utilities",
-                    "base": 0.5,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Fuel",
-                    "base": 0.5,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [],
+        "buckets": [
+            BucketSpec("SmartBuy Monthly", 10000.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # 10% SmartBuy (33 pts per 150 = 10% cap at 10k)
+            RuleSpec("Travel - Flights", 3.3, 7.0, "SmartBuy Monthly"),
+            RuleSpec("Travel - Hotels", 3.3, 7.0, "SmartBuy Monthly"),
+            # 5% Base on all eligible
+            RuleSpec("Dining", 3.3, 1.7),
+            RuleSpec("Shopping", 3.3, 1.7),
+            RuleSpec("Groceries", 3.3, 1.7),
+            RuleSpec("Entertainment", 3.3, 1.7),
+            RuleSpec("Travel - Cabs & Rideshare", 3.3, 1.7),
+            # Lower categories
+            RuleSpec("Utilities", 3.3, 0.0),
+            RuleSpec("Fuel", 3.3, 0.0),
+            # Exclusions
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+            RuleSpec("Insurance", *NO_EARN),
+        ],
+        "partners": [
+            PartnerSpec("Singapore Airlines KrisFlyer", 1.0, 1.50),
+            PartnerSpec("Marriott Bonvoy", 2.5, 0.80),
+            PartnerSpec("InterMiles", 0.5, 1.00),
+            PartnerSpec("Club Vistara", 1.0, 1.20),
+            PartnerSpec("British Airways Avios", 1.0, 1.30),
+        ],
+    },
+    # ==========================================
+    # CARD 7: AU Small Finance Bank LIT (Customizable)
+    # ==========================================
+    {
+        "card": {
+            "name": "AU LIT Credit Card",
+            "bank": "AU Small Finance",
+            "network": "Rupay",
+            "monthly_limit": 100000.0,
+            "billing_cycle_start": 12,
+            "rewards_currency": "Cashback",
+            "base_point_value": 1.00,
+            "min_spend_per_point": 100.0,
+            "description": "Pick 3 categories for 3.5% cashback (₹3.5 per ₹100, capped at ₹750/month), 0.5% on rest. No annual fee.",
         },
-        # ==========================================
-        # CARD 8: IDFC First Select (Fuel Surcharge Waiver King)
-        # ==========================================
-        {
-            "card": CreditCard(
-                name="IDFC First Select",
-                bank="IDFC First",
-                network="Visa Signature",
-                monthly_limit=250000.0,
-                billing_cycle_start=3,
-                rewards_currency="Reward Points",
-                base_point_value=0.25,
-                min_spend_per_point=150.0,
-                description="Earns 10 Reward Points per ₹150 spent. 10x on travel, 6x on fuel, 3x on dining/shopping. Points worth ₹0.25 each.",
-            ),
-            "buckets": [
-                CapBucket(
-                    name="10x Category Cap",
-                    max_points=3000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-                CapBucket(
-                    name="Fuel Cap",
-                    max_points=1000.0,
-                    period=PeriodType.STATEMENT_MONTH,
-                ),
-            ],
-            "rules": [
-                # 10x on selected categories (usually travel)
-                {
-                    "category": "Travel - Flights",
-                    "base": 1.0,
-                    "bonus": 9.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Hotels",
-                    "base": 1.0,
-                    "bonus": 9.0,
-                    "bucket_idx": 0,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Travel - Cabs & Rideshare",
-                    "base": 1.0,
-                    "bonus": 4.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 6x on Fuel (unlimited surcharge waiver)
-                {
-                    "category": "Fuel",
-                    "base": 1.0,
-                    "bonus": 5.0,
-                    "bucket_idx": 1,
-                    "min_spend": 0,
-                },
-                # 3x on others
-                {
-                    "category": "Dining",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Shopping",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Groceries",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Entertainment",
-                    "base": 1.0,
-                    "bonus": 2.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # 1x on utilities
-                {
-                    "category": "Utilities",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Telecom & Internet",
-                    "base": 1.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                # Exclusions
-                {
-                    "category": "Rent",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Wallet & Prepaid Loads",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Insurance",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-                {
-                    "category": "Government Services",
-                    "base": 0.0,
-                    "bonus": 0.0,
-                    "bucket_idx": None,
-                    "min_spend": 0,
-                },
-            ],
-            "partners": [
-                {"name": "Club Vistara", "ratio": 3.0, "value": 0.50},
-                {"name": "InterMiles", "ratio": 2.0, "value": 0.40},
-            ],
+        "buckets": [
+            BucketSpec("Selected Category Cap", 750.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # User-selected 3 categories at 3.5% (assuming common choices)
+            RuleSpec("Dining", 0.5, 3.0, "Selected Category Cap"),
+            RuleSpec("Groceries", 0.5, 3.0, "Selected Category Cap"),
+            RuleSpec("Entertainment", 0.5, 3.0, "Selected Category Cap"),
+            # 0.5% on everything else
+            RuleSpec("Shopping", 0.5, 0.0),
+            RuleSpec("Travel - Flights", 0.5, 0.0),
+            RuleSpec("Utilities", 0.5, 0.0),
+            RuleSpec("Fuel", 0.5, 0.0),
+            # Exclusions
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+        ],
+        "partners": [],
+    },
+    # ==========================================
+    # CARD 8: IDFC First Select (Fuel Surcharge Waiver King)
+    # ==========================================
+    {
+        "card": {
+            "name": "IDFC First Select",
+            "bank": "IDFC First",
+            "network": "Visa Signature",
+            "monthly_limit": 250000.0,
+            "billing_cycle_start": 3,
+            "rewards_currency": "Reward Points",
+            "base_point_value": 0.25,
+            "min_spend_per_point": 150.0,
+            "description": "Earns 10 Reward Points per ₹150 spent. 10x on travel, 6x on fuel, 3x on dining/shopping. Points worth ₹0.25 each.",
         },
-    ]
+        "buckets": [
+            BucketSpec("10x Category Cap", 3000.0, PeriodType.STATEMENT_MONTH),
+            BucketSpec("Fuel Cap", 1000.0, PeriodType.STATEMENT_MONTH),
+        ],
+        "rules": [
+            # 10x on selected categories (usually travel)
+            RuleSpec("Travel - Flights", 1.0, 9.0, "10x Category Cap"),
+            RuleSpec("Travel - Hotels", 1.0, 9.0, "10x Category Cap"),
+            RuleSpec("Travel - Cabs & Rideshare", 1.0, 4.0),
+            # 6x on Fuel (unlimited surcharge waiver)
+            RuleSpec("Fuel", 1.0, 5.0, "Fuel Cap"),
+            # 3x on others
+            RuleSpec("Dining", 1.0, 2.0),
+            RuleSpec("Shopping", 1.0, 2.0),
+            RuleSpec("Groceries", 1.0, 2.0),
+            RuleSpec("Entertainment", 1.0, 2.0),
+            # 1x on utilities
+            RuleSpec("Utilities", *FLAT_1X),
+            RuleSpec("Telecom & Internet", *FLAT_1X),
+            # Exclusions
+            RuleSpec("Rent", *NO_EARN),
+            RuleSpec("Wallet & Prepaid Loads", *NO_EARN),
+            RuleSpec("Insurance", *NO_EARN),
+            RuleSpec("Government Services", *NO_EARN),
+        ],
+        "partners": [
+            PartnerSpec("Club Vistara", 3.0, 0.50),
+            PartnerSpec("InterMiles", 2.0, 0.40),
+        ],
+    },
+]
+
+
+def get_card_definitions():
+    """
+    Returns a comprehensive list of credit card setups with realistic reward rules.
+
+    Each card includes:
+    - Multiple cap buckets for different reward categories
+    - Varied multipliers (base + bonus) simulating real-world earn rates
+    - min_spend thresholds where applicable
+    - Realistic redemption partners with varying transfer ratios
+    """
+    validate_rule_categories(CARD_DEFINITIONS)
+    return CARD_DEFINITIONS
+
+
+def validate_rule_categories(definitions) -> None:
+    """
+    Fails fast on rule categories the rewards engine could never match.
+
+    A rule matches on a category name or alias (data/categories.json), a
+    merchant, a platform, or one of the fallback names. A typo anywhere else
+    would silently seed a rule that never fires.
+    """
+    categories = load_categories()["categories"]
+
+    valid = frozenset(
+        [c["name"] for c in categories]
+        + [alias for c in categories for alias in c.get("aliases", [])]
+        + list(MERCHANTS)
+        + PLATFORMS
+    ) | FALLBACK_CATEGORIES
+
+    unknown = sorted(
+        {rule.category for defi in definitions for rule in defi["rules"]} - valid
+    )
+    if unknown:
+        raise ValueError(f"Unknown reward rule categories in seed data: {unknown}")
 
 
 # --- MAIN SEED FUNCTION ---
-def seed():
-    print(f"🌱 Seeding Database with {NUM_TRANSACTIONS} randomized transactions...")
+def _insert_cards(session: Session, definitions) -> None:
+    """Insert cards with their buckets, rules and partners (no commit)."""
+    # Everything goes through Core executemany INSERTs; cards and buckets use
+    # RETURNING (in parameter order) to get the ids the rules and partners
+    # below point at.
+    card_ids = session.scalars(
+        insert(CreditCard).returning(CreditCard.id, sort_by_parameter_order=True),
+        [
+            # Validate through the model so every row carries its defaults
+            CreditCard.model_validate(defi["card"]).model_dump(exclude={"id"})
+            for defi in definitions
+        ],
+    ).all()
+
+    # Add Buckets
+    bucket_keys = []
+    bucket_rows = []
+    for card_id, defi in zip(card_ids, definitions):
+        for b in defi["buckets"]:
+            bucket_keys.append((card_id, b.name))
+            bucket_rows.append({**b._asdict(), "card_id": card_id})
+    bucket_ids = dict(
+        zip(
+            bucket_keys,
+            session.scalars(
+                insert(CapBucket).returning(CapBucket.id, sort_by_parameter_order=True),
+                bucket_rows,
+            ).all(),
+        )
+    )
+
+    rule_rows = []
+    partner_rows = []
+    for card_id, defi in zip(card_ids, definitions):
+        # Add Rules
+        for rule in defi["rules"]:
+            rule_rows.append(
+                {
+                    "card_id": card_id,
+                    "category": rule.category,
+                    "base_multiplier": rule.base,
+                    "bonus_multiplier": rule.bonus,
+                    "cap_bucket_id": bucket_ids.get((card_id, rule.bucket)),
+                    "min_spend": rule.min_spend,
+                    "match_conditions": rule.match_conditions,
+                }
+            )
+
+        # Add Redemption Partners (if any)
+        # Cashback cards have none - no partners needed
+        for p in defi["partners"]:
+            partner_rows.append(
+                {
+                    "card_id": card_id,
+                    "partner_name": p.name,
+                    "transfer_ratio": p.ratio,
+                    "estimated_value": p.value,
+                }
+            )
+
+    session.execute(insert(RewardRule), rule_rows)
+    if partner_rows:
+        session.execute(insert(RedemptionPartner), partner_rows)
+
+
+def _is_online(category: str, platform: str, rand) -> bool:
+    """Simulated online flag for a generated expense."""
+    if category in ONLINE_CATEGORIES:
+        return True
+    if category == "Shopping":
+        return rand() < 0.6  # 60% online
+    if category == "Fuel":
+        return False
+    if category in ("Dining", "Groceries"):
+        # Online if platform is food delivery app or online grocer (inferred)
+        # But here we simulate it:
+        return platform != "Direct" or rand() < 0.3
+    return platform != "Direct"
+
+
+def _insert_expenses(session: Session, card_ids, num_transactions: int) -> None:
+    """Generate random expenses across card_ids (no commit)."""
+    rng = random.Random(SEED)  # Private generator: no shared-state lookups per draw
+    # Bind the generator methods once; the column draws below call them per row
+    lognormvariate = rng.lognormvariate
+    randrange = rng.randrange
+    choices = rng.choices
+    rand = rng.random
+    # "now" is captured once. Dates are stored as SQLAlchemy's SQLite
+    # DATETIME text, so every possible day prefix and time of day
+    # (09:00-23:59, seconds/micros of "now" kept) is formatted up front
+    # and a row's date is just a concatenation of two table lookups.
+    today = datetime.now()
+    day_prefixes = [
+        (today - timedelta(days=d)).strftime("%Y-%m-%d ")
+        for d in range(DAYS_HISTORY + 1)
+    ]
+    time_suffix = today.strftime(":%S.%f")
+    times_of_day = [
+        f"{m // 60:02d}:{m % 60:02d}{time_suffix}" for m in range(9 * 60, 24 * 60)
+    ]
+
+    # Rows are generated and inserted BATCH_SIZE at a time so memory
+    # stays O(BATCH_SIZE) however large num_transactions grows.
+    for start in range(0, num_transactions, BATCH_SIZE):
+        n = min(BATCH_SIZE, num_transactions - start)
+
+        # Every column is drawn as a whole list - uniform picks via choices(k=n),
+        # which loops in C - then zip() assembles the row tuples in
+        # EXPENSE_COLUMNS order, with no per-row dict or tuple building.
+        # A. Pick a random card
+        card_col = choices(card_ids, k=n)
+
+        # B. Pick a random Category & Merchant
+        cat_idxs = choices(range(len(CATEGORIES)), k=n)
+        categories = [CATEGORIES[i] for i in cat_idxs]
+        merchants = [
+            MERCHANTS[randrange(MERCHANT_OFFSETS[i], MERCHANT_OFFSETS[i + 1])]
+            for i in cat_idxs
+        ]
+
+        # C. Pick a random Platform (biased slightly towards Direct)
+        platforms = choices(PLATFORMS, cum_weights=PLATFORM_CUM_WEIGHTS, k=n)
+
+        # Determine Online Status
+        online = [_is_online(c, p, rand) for c, p in zip(categories, platforms)]
+
+        # D. Random Amount (lognormal: mostly small, sometimes big)
+        amounts = [
+            round(
+                min(
+                    max(lognormvariate(AMOUNT_MU, AMOUNT_SIGMA), MIN_AMOUNT),
+                    MAX_AMOUNT,
+                ),
+                2,
+            )
+            for _ in range(n)
+        ]
+
+        # E. Random Date (0 to DAYS_HISTORY days ago) at a random time of day
+        dates = [
+            day + time
+            for day, time in zip(choices(day_prefixes, k=n), choices(times_of_day, k=n))
+        ]
+
+        expenses = list(
+            zip(
+                card_col,
+                amounts,
+                merchants,
+                categories,
+                platforms,
+                dates,
+                online,
+                repeat(0.0),  # points_earned: to be calculated by the brain later!
+            )
+        )
+
+        # Driver-level executemany per batch: the rows are already in
+        # column order, so this skips SQLAlchemy's per-row parameter
+        # processing. All batches share the caller's transaction.
+        session.connection().exec_driver_sql(INSERT_EXPENSE_SQL, expenses)
+        if num_transactions > BATCH_SIZE:
+            print(f"   ... {start + n}/{num_transactions}")
+
+
+@contextmanager
+def _bulk_load_session():
+    """
+    Session on a dedicated connection with a larger page cache for bulk
+    loading (seed() may also switch off fsyncs on it). The connection is
+    invalidated afterwards instead of going back to the shared pool, so
+    these settings never reach other callers of src.db.engine (seed() can
+    be imported and run inside a process).
+    """
+    with engine.connect() as conn:
+        try:
+            with Session(bind=conn) as session:
+                session.execute(text("PRAGMA cache_size=-200000"))  # ~200 MB
+                yield session
+        finally:
+            conn.invalidate()
+
+
+def seed(num_transactions: int = NUM_TRANSACTIONS, definitions=None, append=False):
+    """
+    Seed cards and num_transactions random expenses into an empty database.
+
+    definitions defaults to the built-in CARD_DEFINITIONS; pass another list
+    in the same shape to seed a different card set. If the database already
+    has cards, nothing is done unless append=True, which adds transactions
+    to the existing cards.
+
+    Cards and expenses are written in a single transaction, so a seed that
+    fails partway leaves the database as it was and can simply be re-run.
+    """
+    if definitions is None:
+        definitions = get_card_definitions()
+    else:
+        validate_rule_categories(definitions)
+
+    print(f"🌱 Seeding Database with {num_transactions} randomized transactions...")
     create_db_and_tables()
 
-    with Session(engine) as session:
+    with _bulk_load_session() as session:
         # Clear existing data to avoid duplicates/mess (Optional)
         # Uncomment these lines if you want a fresh start every time
         # session.exec(delete(Expense))
@@ -1113,150 +824,57 @@ def seed():
         # session.exec(delete(CreditCard))
         # session.commit()
 
-        if session.exec(select(CreditCard)).first():
+        # Checked before anything else so a re-run on a seeded DB is a no-op
+        has_cards = session.exec(select(CreditCard.id).limit(1)).first() is not None
+        if has_cards and not append:
+            print(
+                "⚠️  Database already has cards. Nothing to do (use --append to add Transactions only)."
+            )
+            return
+
+        if has_cards:
             print(
                 "⚠️  Database already has cards. Skipping Card creation (will add Transactions only)."
             )
         else:
+            # A fresh database holds nothing but this seed, so skip fsyncs
+            # entirely. Appending to an existing wallet keeps the engine's
+            # durable synchronous=NORMAL.
+            session.execute(text("PRAGMA synchronous=OFF"))
+
             # 1. Create Cards & Rules
-            definitions = get_card_definitions()
-            for defi in definitions:
-                card = defi["card"]
-                session.add(card)
-                session.commit()
-                session.refresh(card)
-
-                # Add Buckets
-                bucket_objs = []
-                for b in defi["buckets"]:
-                    b.card_id = card.id
-                    session.add(b)
-                    bucket_objs.append(b)
-                session.commit()
-                for b in bucket_objs:
-                    session.refresh(b)
-
-                # Add Rules
-                for r in defi["rules"]:
-                    bucket_id = (
-                        bucket_objs[r["bucket_idx"]].id
-                        if r["bucket_idx"] is not None
-                        else None
-                    )
-                    rule = RewardRule(
-                        card_id=card.id,
-                        category=r["category"],
-                        base_multiplier=r["base"],
-                        bonus_multiplier=r["bonus"],
-                        cap_bucket_id=bucket_id,
-                        min_spend=r.get("min_spend", 0.0),
-                        match_conditions=r.get("match_conditions"),
-                    )
-                    session.add(rule)
-
-                # Add Redemption Partners (if any)
-                partners = defi.get("partners", [])
-                if partners:
-                    for p in partners:
-                        partner = RedemptionPartner(
-                            card_id=card.id,
-                            partner_name=p["name"],
-                            transfer_ratio=p["ratio"],
-                            estimated_value=p["value"],
-                        )
-                        session.add(partner)
-                else:
-                    # Fallback for cashback cards - no partners needed
-                    pass
-
-                session.commit()
+            _insert_cards(session, definitions)
             print("✅ Cards, Rules & Limits Created.")
 
         # 2. Generate Random Transactions
         # Fetch all cards to assign transactions randomly
-        all_cards = session.exec(select(CreditCard)).all()
-        if not all_cards:
+        all_card_ids = session.exec(select(CreditCard.id)).all()
+        if not all_card_ids:
             print("❌ Error: No cards found!")
             return
 
-        expenses = []
-        today = datetime.now()
-
-        print(f"🎲 Generating {NUM_TRANSACTIONS} expenses...")
-
-        for _ in range(NUM_TRANSACTIONS):
-            # A. Pick a random card
-            card = random.choice(all_cards)
-
-            # B. Pick a random Category & Merchant
-            category = random.choice(list(MERCHANTS_BY_CATEGORY.keys()))
-            merchant = random.choice(MERCHANTS_BY_CATEGORY[category])
-
-            # C. Pick a random Platform (biased slightly towards Direct)
-            if random.random() < 0.4:
-                platform = "Direct"
-            else:
-                platform = random.choice(PLATFORMS)
-
-            # Determine Online Status
-            is_online = False
-            if category in [
-                "Travel - Flights",
-                "Travel - Hotels",
-                "Travel - Cabs & Rideshare",
-                "Entertainment",
-                "Telecom & Internet",
-                "Amazon India",  # From specific Merchant rule
-            ]:
-                is_online = True
-            elif category == "Shopping":
-                is_online = random.random() < 0.6  # 60% online
-            elif category == "Fuel":
-                is_online = False
-            elif category in ["Dining", "Groceries"]:
-                # Online if platform is food delivery app or online grocer (inferred)
-                # But here we simulate it:
-                is_online = platform != "Direct" or random.random() < 0.3
-            elif platform != "Direct":
-                is_online = True
-
-            # D. Random Amount (Weighted: mostly small, sometimes big)
-            if random.random() < 0.7:
-                amount = random.uniform(100, 3000)  # Common spend
-            elif random.random() < 0.9:
-                amount = random.uniform(3000, 15000)  # Occasional spend
-            else:
-                amount = random.uniform(15000, 80000)  # Big ticket
-
-            # E. Random Date (0 to DAYS_HISTORY days ago)
-            days_ago = random.randint(0, DAYS_HISTORY)
-            txn_date = today - timedelta(days=days_ago)
-            # Add random time to the date
-            txn_date = txn_date.replace(
-                hour=random.randint(9, 23), minute=random.randint(0, 59)
-            )
-
-            # Create Expense
-            exp = Expense(
-                card_id=card.id,
-                amount=round(amount, 2),
-                merchant=merchant,
-                category=category,
-                platform=platform,
-                date=txn_date,
-                is_online=is_online,
-                points_earned=0.0,  # To be calculated by the brain later!
-            )
-            expenses.append(exp)
-
-        # Batch insert for speed
-        session.add_all(expenses)
+        print(f"🎲 Generating {num_transactions} expenses...")
+        _insert_expenses(session, all_card_ids, num_transactions)
         session.commit()
 
         print(
-            f"✅ Successfully seeded {NUM_TRANSACTIONS} transactions across {len(all_cards)} cards."
+            f"✅ Successfully seeded {num_transactions} transactions across {len(all_card_ids)} cards."
         )
 
 
 if __name__ == "__main__":
-    seed()
+    parser = argparse.ArgumentParser(description="Seed the database with demo data.")
+    parser.add_argument(
+        "-n",
+        "--transactions",
+        type=int,
+        default=NUM_TRANSACTIONS,
+        help=f"number of random expenses to generate (default: {NUM_TRANSACTIONS})",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="add transactions to an already seeded database",
+    )
+    args = parser.parse_args()
+    seed(args.transactions, append=args.append)
@@ -4,7 +4,13 @@ import warnings
 from sqlmodel import Session
 
 from src.db import engine
-from src.logic.recommender import recommend_all_cards, recommend_card
+from src.logic.recommender import (
+    RecommendationRequest,
+    load_all_cards,
+    recommend_all_cards_batch,
+    recommend_card,
+)
+from scripts.report import run_buffered
 
 # Suppress SQLAlchemy autoflush warnings for cleaner output
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -41,68 +47,36 @@ def test_recommender():
     with Session(engine) as session:
         print_header("CARD RECOMMENDER TESTS")
 
-        # Test 1: Amazon Shopping
-        print_subheader("📦 Test 1: ₹5000 Amazon Shopping")
-        results = recommend_all_cards(session, 5000, "Amazon", "Shopping", "Amazon")
-        if not results:
-            print("❌ No cards found!")
-            return
-        for r in results[:5]:
-            print_card_result(r, verbose=False)
-
-        # Test 2: Food Delivery
-        print_subheader("🍽️  Test 2: ₹2000 Swiggy Food Delivery")
-        results = recommend_all_cards(session, 2000, "Swiggy", "Food Delivery", "Swiggy")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 3: Large Travel Purchase
-        print_subheader("✈️  Test 3: ₹50000 Flight Booking (MakeMyTrip)")
-        results = recommend_all_cards(session, 50000, "MakeMyTrip", "Travel", "MakeMyTrip")
-        for r in results[:3]:
-            print_card_result(r, verbose=True)
-
-        # Test 4: Grocery
-        print_subheader("🛒 Test 4: ₹3000 BigBasket Grocery")
-        results = recommend_all_cards(session, 3000, "BigBasket", "Grocery", "BigBasket")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 5: Fuel
-        print_subheader("⛽ Test 5: ₹5000 Fuel Purchase")
-        results = recommend_all_cards(session, 5000, "HP Petrol", "Fuel", "Direct")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 6: Entertainment / OTT
-        print_subheader("🎬 Test 6: ₹1500 Netflix Subscription")
-        results = recommend_all_cards(session, 1500, "Netflix", "Entertainment", "Netflix")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 7: Utility Bills
-        print_subheader("💡 Test 7: ₹4000 Electricity Bill")
-        results = recommend_all_cards(session, 4000, "BESCOM", "Utilities", "Direct")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 8: Dining Out
-        print_subheader("🍴 Test 8: ₹3500 Restaurant Dining")
-        results = recommend_all_cards(session, 3500, "Mainland China", "Dining", "Direct")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 9: Small Purchase (Edge Case)
-        print_subheader("🪙 Test 9: ₹100 Small Purchase")
-        results = recommend_all_cards(session, 100, "Local Store", "General", "Direct")
-        for r in results[:3]:
-            print_card_result(r, verbose=False)
-
-        # Test 10: Large Luxury Purchase
-        print_subheader("💎 Test 10: ₹200000 Luxury Watch")
-        results = recommend_all_cards(session, 200000, "Ethos", "Luxury", "Direct")
-        for r in results[:3]:
-            print_card_result(r, verbose=True)
+        # Load cards (rules, caps, partners eager-loaded) once for every test below
+        cards = load_all_cards(session)
+
+        # All ten transactions are scored in one batch, then printed in order:
+        # (title, amount, merchant, category, platform, results shown, verbose)
+        tests = [
+            ("📦 Test 1: ₹5000 Amazon Shopping", 5000, "Amazon", "Shopping", "Amazon", 5, False),
+            ("🍽️  Test 2: ₹2000 Swiggy Food Delivery", 2000, "Swiggy", "Food Delivery", "Swiggy", 3, False),
+            ("✈️  Test 3: ₹50000 Flight Booking (MakeMyTrip)", 50000, "MakeMyTrip", "Travel", "MakeMyTrip", 3, True),
+            ("🛒 Test 4: ₹3000 BigBasket Grocery", 3000, "BigBasket", "Grocery", "BigBasket", 3, False),
+            ("⛽ Test 5: ₹5000 Fuel Purchase", 5000, "HP Petrol", "Fuel", "Direct", 3, False),
+            ("🎬 Test 6: ₹1500 Netflix Subscription", 1500, "Netflix", "Entertainment", "Netflix", 3, False),
+            ("💡 Test 7: ₹4000 Electricity Bill", 4000, "BESCOM", "Utilities", "Direct", 3, False),
+            ("🍴 Test 8: ₹3500 Restaurant Dining", 3500, "Mainland China", "Dining", "Direct", 3, False),
+            ("🪙 Test 9: ₹100 Small Purchase", 100, "Local Store", "General", "Direct", 3, False),
+            ("💎 Test 10: ₹200000 Luxury Watch", 200000, "Ethos", "Luxury", "Direct", 3, True),
+        ]
+        batch = recommend_all_cards_batch(
+            session,
+            [RecommendationRequest(*test[1:5]) for test in tests],
+            cards=cards,
+        )
+
+        for (title, *_, top_n, verbose), results in zip(tests, batch):
+            print_subheader(title)
+            if not results:
+                print("❌ No cards found!")
+                return
+            for r in results[:top_n]:
+                print_card_result(r, verbose=verbose)
 
         # Summary: Best Card Function
         print_subheader("🏆 QUICK BEST CARD TESTS")
@@ -112,7 +86,7 @@ def test_recommender():
             (25000, "IRCTC", "Travel", "IRCTC"),
         ]
         for amount, merchant, category, platform in test_cases:
-            best = recommend_card(session, amount, merchant, category, platform)
+            best = recommend_card(session, amount, merchant, category, platform, cards=cards)
             if best:
                 print(f"₹{amount} {merchant}: {best['card_name']} → ₹{best['cash_value']['best_value']:.0f}")
 
@@ -120,4 +94,4 @@ def test_recommender():
 
 
 if __name__ == "__main__":
-    test_recommender()
+    run_buffered(test_recommender)
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from sqlmodel import Session, select
 
+from scripts.report import run_buffered
 from src import (
     BucketScope,
     CapBucket,
@@ -13,6 +14,9 @@ from src import (
 )
 from src.logic.rewards import calculate_rewards
 
+# One timestamp for every test expense, so they all land in the same periods
+NOW = datetime.now()
+
 
 def test_rewards():
     with Session(engine) as session:
@@ -26,8 +30,7 @@ def test_rewards():
             min_spend_per_point=100.0,  # (amount/100) * rate
         )
         session.add(test_card)
-        session.commit()
-        session.refresh(test_card)
+        session.flush()  # Assigns test_card.id; committed once setup is done
 
         # Add Rules
         # 1. Dining Rule (2x Base + 2x Bonus, Capped at 2000)
@@ -38,7 +41,7 @@ def test_rewards():
             period=PeriodType.STATEMENT_MONTH,
         )
         session.add(dining_bucket)
-        session.commit()
+        session.flush()  # Assigns dining_bucket.id for the rule below
 
         dining_rule = RewardRule(
             category="Dining",
@@ -68,7 +71,7 @@ def test_rewards():
         )
         session.add(global_bucket)
 
-        session.commit()
+        session.commit()  # Single commit for the whole setup
         session.refresh(test_card)  # Load relationships
 
         print(f"Test Card Created: {test_card.name} [ID: {test_card.id}]")
@@ -80,7 +83,7 @@ def test_rewards():
             merchant="Chili's",
             category="Dining",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
         )
         exp1.card = test_card
         res1 = calculate_rewards(session, exp1)
@@ -95,7 +98,7 @@ def test_rewards():
             merchant="Shell",
             category="Fuel",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
         )
         exp2.card = test_card
         res2 = calculate_rewards(session, exp2)
@@ -110,7 +113,7 @@ def test_rewards():
             merchant="NoBroker",
             category="Rent",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
         )
         exp3.card = test_card
         res3 = calculate_rewards(session, exp3)
@@ -125,7 +128,7 @@ def test_rewards():
             merchant="Apple Store",
             category="Shopping",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
             points_earned=60000,  # Exceeds 50k
         )
         large_tx.card = test_card
@@ -139,7 +142,7 @@ def test_rewards():
             merchant="Test",
             category="Dining",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
         )
         exp4.card = test_card
         res4 = calculate_rewards(session, exp4)
@@ -156,7 +159,7 @@ def test_rewards():
             merchant="NoBroker",
             category="Rent",
             card_id=test_card.id,
-            date=datetime.now(),
+            date=NOW,
         )
         exp5.card = test_card
         res5 = calculate_rewards(session, exp5)
@@ -176,7 +179,7 @@ def test_rewards():
                 merchant="Random Site",
                 category="Shopping",
                 card_id=sbi_card.id,
-                date=datetime.now(),
+                date=NOW,
                 is_online=True,
             )
             exp6.card = sbi_card
@@ -191,7 +194,7 @@ def test_rewards():
                 merchant="Local Shop",
                 category="Shopping",
                 card_id=sbi_card.id,
-                date=datetime.now(),
+                date=NOW,
                 is_online=False,
             )
             exp6b.card = sbi_card
@@ -216,7 +219,7 @@ def test_rewards():
                 merchant="Mystery",
                 category="Unknown",
                 card_id=hdfc_card.id,
-                date=datetime.now(),
+                date=NOW,
             )
             exp7.card = hdfc_card
             res7 = calculate_rewards(session, exp7)
@@ -228,4 +231,4 @@ def test_rewards():
 
 
 if __name__ == "__main__":
-    test_rewards()
+    run_buffered(test_rewards)
@@ -9,11 +9,27 @@ Tests:
 
 from datetime import datetime
 
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
+from scripts.report import run_buffered
 from src import CreditCard, Expense, create_db_and_tables, engine
 from src.logic.rewards import RewardsEngine
 
+# Seeded card names (scripts/seed.py), an exact match on the indexed name column
+PRIME_CARD_NAME = "ICICI Amazon Pay (Prime)"
+NON_PRIME_CARD_NAME = "ICICI Amazon Pay (Non-Prime)"
+GENERIC_CARD_NAME = "HDFC Regalia Gold"
+
+# Everything calculate_rewards touches on a card, loaded with the card
+EAGER_CARD_LOADS = (
+    selectinload(CreditCard.reward_rules),
+    selectinload(CreditCard.cap_buckets),
+)
+
+# One timestamp for every test expense, so they all land in the same periods
+NOW = datetime.now()
+
 
 def test_tier_matching():
     """Test that tier matching works correctly."""
@@ -22,21 +38,27 @@ def test_tier_matching():
     with Session(engine) as session:
         # Find Amazon ICICI cards (Prime and Non-Prime)
         prime_card = session.exec(
-            select(CreditCard).where(CreditCard.name.contains("Prime"))
+            select(CreditCard)
+            .where(CreditCard.name == PRIME_CARD_NAME)
+            .options(*EAGER_CARD_LOADS)
         ).first()
 
         non_prime_card = session.exec(
-            select(CreditCard).where(CreditCard.name.contains("Non-Prime"))
+            select(CreditCard)
+            .where(CreditCard.name == NON_PRIME_CARD_NAME)
+            .options(*EAGER_CARD_LOADS)
         ).first()
 
         # Find a card without tier_status (e.g., HDFC Regalia)
         generic_card = session.exec(
-            select(CreditCard).where(CreditCard.name.contains("Regalia"))
+            select(CreditCard)
+            .where(CreditCard.name == GENERIC_CARD_NAME)
+            .options(*EAGER_CARD_LOADS)
         ).first()
 
         if not prime_card or not non_prime_card:
             print("❌ Run seed.py first to create test cards!")
-            print("   uv run python scripts/seed.py")
+            print("   uv run python -m scripts.seed")
             return
 
         print("=" * 60)
@@ -67,7 +89,7 @@ def test_tier_matching():
             merchant="Amazon India",
             category="Shopping",
             platform="Direct",
-            date=datetime.now(),
+            date=NOW,
             card_id=prime_card.id,
         )
         expense_prime.card = prime_card
@@ -85,7 +107,7 @@ def test_tier_matching():
             merchant="Amazon India",
             category="Shopping",
             platform="Direct",
-            date=datetime.now(),
+            date=NOW,
             card_id=non_prime_card.id,
         )
         expense_non_prime.card = non_prime_card
@@ -104,7 +126,7 @@ def test_tier_matching():
                 merchant="Amazon India",
                 category="Shopping",
                 platform="Direct",
-                date=datetime.now(),
+                date=NOW,
                 card_id=generic_card.id,
             )
             expense_generic.card = generic_card
@@ -139,4 +161,4 @@ def test_tier_matching():
 
 
 if __name__ == "__main__":
-    test_tier_matching()
+    run_buffered(test_tier_matching)
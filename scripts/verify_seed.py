@@ -1,4 +1,4 @@
-from sqlmodel import Session, select, create_engine
+from sqlmodel import Session, select
 from src import CreditCard, RewardRule, engine
 
 
@@ -9,16 +9,18 @@ def verify():
         print(f"Found {len(cards)} cards.")
         amazon_cards = [c for c in cards if "Amazon" in c.name]
         for card in amazon_cards:
-            print(f"Card: {card.name}, Meta: {card.meta_data}")
+            print(f"Card: {card.name}, Tier: {card.tier_status}")
 
         # Check Rules
-        rules = session.exec(
-            select(RewardRule).where(RewardRule.condition_expression != None)
-        ).all()
+        # match_conditions is JSON: "no conditions" is stored as JSON null,
+        # which SQL IS NOT NULL can't tell apart, so filter after loading.
+        rules = [
+            r for r in session.exec(select(RewardRule)).all() if r.match_conditions
+        ]
         print(f"Found {len(rules)} conditional rules.")
         for rule in rules:
             print(
-                f"Rule Category: {rule.category}, Condition: {rule.condition_expression} (Card ID: {rule.card_id})"
+                f"Rule Category: {rule.category}, Conditions: {rule.match_conditions} (Card ID: {rule.card_id})"
             )
 
 
@@ -1,15 +1,29 @@
 import json
+import os
 import traceback
+from contextlib import asynccontextmanager
+from datetime import date as date_type
 from datetime import datetime, timedelta
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
-from typing import Optional
+from time import monotonic
+from typing import Literal, Optional
 
+import anyio
+import orjson
 from ddgs import DDGS
 from mcp.server.fastmcp import FastMCP
-from sqlmodel import Session, and_, col, func, or_, select, text
-
-from src.db import engine
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, and_, col, delete, func, or_, select, text
+
+from src.categories import (
+    get_category_names,
+    get_excluded_category_names,
+    infer_merchant_category,
+    load_categories,
+)
+from src.db import create_db_and_tables, engine
 from src.logic.recommender import recommend_all_cards
 from src.logic.rewards import calculate_rewards
 from src.models import (
@@ -24,15 +38,61 @@ from src.models import (
     RewardRule,
 )
 
-# Path to categories data
-CATEGORIES_FILE = Path(__file__).parent / "data" / "categories.json"
-
 # Bank domain mapping - loaded dynamically from data/bank_domains.json
 BANK_DOMAINS_FILE = Path(__file__).parent / "data" / "bank_domains.json"
 
 logger = getLogger(__name__)
 
-mcp = FastMCP("swipe-smart")
+# Set MCP_DEBUG=1 (or true/yes) to include tracebacks in tool error
+# responses (they are always written to the log)
+DEBUG_ERRORS = os.getenv("MCP_DEBUG", "").strip().lower() in {"1", "true", "yes"}
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Ensures the schema exists before the first tool call is served."""
+    create_db_and_tables()
+    yield
+
+
+mcp = FastMCP("swipe-smart", lifespan=lifespan)
+
+# Validation vocabularies - built once at import, not per tool call
+VALID_NETWORKS = ["Visa", "Mastercard", "RuPay", "Amex", "Diners", "Unknown"]
+VALID_PERIODS = [p.value for p in PeriodType]
+VALID_SCOPES = [s.value for s in BucketScope]
+VALID_ADJUSTMENT_TYPES = [t.value for t in AdjustmentType]
+
+# Categories that earn no rewards by default (membership test per transaction)
+EXCLUDED_CATEGORIES = frozenset(get_excluded_category_names())
+
+# Signals used to infer is_online when the caller doesn't say
+ONLINE_CATEGORIES = frozenset(
+    {
+        "Shopping - Online",
+        "Travel - Flights",
+        "Travel - Cabs & Rideshare",
+        "Entertainment",
+        "Education",
+    }
+)
+ONLINE_MERCHANTS = tuple(
+    m.lower()
+    for m in (
+        "Amazon",
+        "Flipkart",
+        "Myntra",
+        "Uber",
+        "Ola",
+        "Swiggy",
+        "Zomato",
+        "Netflix",
+        "Spotify",
+        "Apple",
+        "Google",
+    )
+)
+ONLINE_PLATFORMS = frozenset({"SmartBuy", "Gyftr"})
 
 # =====================================================================
 # HELPERS & UTILITIES
@@ -40,16 +100,9 @@ mcp = FastMCP("swipe-smart")
 # =====================================================================
 
 
-def load_categories() -> dict:
-    """Load categories from JSON file."""
-    with open(CATEGORIES_FILE, "r") as f:
-        return json.load(f)
-
-
-def get_category_names() -> list[str]:
-    """Get list of valid category names."""
-    data = load_categories()
-    return [cat["name"] for cat in data["categories"]]
+# Category names as a Literal so pydantic-core validates them with its
+# literal lookup and the tool schema advertises them as an enum
+CategoryName = Literal[get_category_names()]
 
 
 def _load_bank_domains() -> dict[str, str]:
@@ -328,12 +381,170 @@ def _build_card_queries(card_name: str, issuer_domain: str | None = None) -> lis
     return queries
 
 
+# =====================================================================
+# RESPONSE CACHE
+# Short-lived memo for read-heavy tools; cleared on every write
+# =====================================================================
+
+CACHE_TTL_SECONDS = 60.0
+CACHE_MAX_ENTRIES = 256
+
+_response_cache: dict[tuple, tuple[float, dict]] = {}
+
+
+def _cache_get(key: tuple) -> Optional[dict]:
+    """Returns a cached response if present and not yet expired."""
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at < monotonic():
+        _response_cache.pop(key, None)
+        return None
+    return response
+
+
+def _cache_put(key: tuple, response: dict) -> None:
+    """Stores a response, evicting the oldest entry when full."""
+    if len(_response_cache) >= CACHE_MAX_ENTRIES:
+        _response_cache.pop(next(iter(_response_cache)))
+    _response_cache[key] = (monotonic() + CACHE_TTL_SECONDS, response)
+
+
+def _invalidate_caches() -> None:
+    """Drops all cached responses. Call after any committed write."""
+    _response_cache.clear()
+    _drop_card_name_index()
+
+
+# =====================================================================
+# CARD NAME INDEX
+# The wallet holds a handful of cards, so partial-name lookups are matched
+# against an in-memory lowercased name -> id map instead of an ILIKE scan.
+# Like the response cache it is dropped on every write and expires after
+# CACHE_TTL_SECONDS, which bounds how long cards written by another process
+# can go unseen.
+# =====================================================================
+
+_card_name_index: Optional[dict[str, int]] = None
+_card_name_index_expires_at = 0.0
+
+# ILIKE wildcards; needles containing them skip the index, whose plain
+# substring match would treat them literally
+LIKE_WILDCARDS = frozenset("%_")
+
+
+def _drop_card_name_index() -> None:
+    """Forgets the card name index; the next lookup reloads it."""
+    global _card_name_index
+    _card_name_index = None
+
+
+def _get_card_name_index(session: Session) -> dict[str, int]:
+    """
+    Returns the lowercased name -> id map (in id order), loading it on
+    first use or once expired. add_credit_card rejects case-insensitive
+    duplicate names, so every card gets its own key.
+    """
+    global _card_name_index, _card_name_index_expires_at
+    if _card_name_index is None or _card_name_index_expires_at < monotonic():
+        rows = session.exec(
+            select(CreditCard.name, CreditCard.id).order_by(CreditCard.id)
+        ).all()
+        _card_name_index = {name.lower(): card_id for name, card_id in rows}
+        _card_name_index_expires_at = monotonic() + CACHE_TTL_SECONDS
+    return _card_name_index
+
+
+def _query_cards_by_name(
+    session: Session, card_name: str, options: tuple = ()
+) -> list[CreditCard]:
+    """The authoritative lookup: ILIKE '%card_name%' against the table."""
+    query = (
+        select(CreditCard)
+        .where(col(CreditCard.name).ilike(f"%{card_name}%"))
+        .options(*options)
+    )
+    return list(session.exec(query).all())
+
+
+def _find_cards_by_name(
+    session: Session, card_name: str, options: tuple = ()
+) -> list[CreditCard]:
+    """
+    Cards whose name contains card_name (case-insensitive), fetched by id.
+
+    An exact (case-insensitive) name resolves to that card alone, even when
+    it is also part of a longer name. Falls back to the ILIKE query when the
+    index has no match, when a fetched card's name no longer matches (ids
+    reused or renamed by another process), or when the needle contains LIKE
+    wildcards. Cards added by another process can still be missed until the
+    index expires (CACHE_TTL_SECONDS), the same staleness window as the
+    response cache.
+    """
+    needle = card_name.lower()
+    if not LIKE_WILDCARDS.isdisjoint(needle):
+        return _query_cards_by_name(session, card_name, options)
+
+    index = _get_card_name_index(session)
+
+    # Fast path: the full card name, as get_my_cards lists it. Ids are plain
+    # rowids that SQLite can hand to a different card, so the row must still
+    # carry exactly that name.
+    exact_id = index.get(needle)
+    if exact_id is not None:
+        card = session.get(CreditCard, exact_id, options=options)
+        if card is not None and card.name.lower() == needle:
+            return [card]
+        _drop_card_name_index()
+        return _query_cards_by_name(session, card_name, options)
+
+    card_ids = [card_id for name, card_id in index.items() if needle in name]
+
+    if not card_ids:
+        return _query_cards_by_name(session, card_name, options)
+
+    if len(card_ids) == 1:
+        card = session.get(CreditCard, card_ids[0], options=options)
+        cards = [card] if card is not None else []
+    else:
+        cards = list(
+            session.exec(
+                select(CreditCard)
+                .where(col(CreditCard.id).in_(card_ids))
+                .order_by(CreditCard.id)
+                .options(*options)
+            ).all()
+        )
+
+    # Trust the index only if every id still exists under a matching name
+    if len(cards) == len(card_ids) and all(
+        needle in card.name.lower() for card in cards
+    ):
+        return cards
+
+    _drop_card_name_index()
+    return _query_cards_by_name(session, card_name, options)
+
+
 # =====================================================================
 # GUIDELINES & RULES (MCP Tools - Pre-action Info)
 # =====================================================================
 
 
-@mcp.tool()
+@lru_cache(maxsize=1)
+def _logging_rule_categories() -> tuple[str, str]:
+    """
+    Category and excluded-category lists for the logging rules, joined once.
+    Only the date in the guidelines changes between calls.
+    """
+    return (
+        ", ".join(get_category_names()),
+        ", ".join(get_excluded_category_names()),
+    )
+
+
+@mcp.tool(structured_output=False)
 def get_expense_logging_rules() -> dict:
     """
     **IMPORTANT: Call this tool BEFORE adding any expense.**
@@ -346,20 +557,8 @@ def get_expense_logging_rules() -> dict:
 
     You MUST read these guidelines before calling `add_transaction`.
     """
-    try:
-        categories = get_category_names()
-        cat_list = ", ".join(categories)
-
-        all_cats = load_categories()["categories"]
-        excluded = [
-            c["name"] for c in all_cats if c.get("excluded_from_rewards", False)
-        ]
-        excluded_str = ", ".join(excluded)
-    except Exception:
-        cat_list = "Dining, Groceries, Fuel, Travel"
-        excluded_str = "Fuel, Insurance"
-
-    today = datetime.now().strftime("%Y-%m-%d")
+    cat_list, excluded_str = _logging_rule_categories()
+    today = date_type.today().isoformat()
 
     return {
         "status": "success",
@@ -386,13 +585,39 @@ def get_expense_logging_rules() -> dict:
             "If you found data: show what you extracted with ✅ provided, ✨ inferred, ❌ missing.",
             "Only ask for fields that are missing AND required.",
             "NEVER re-ask for information already provided by the user.",
+            "If the category isn't stated, call classify_merchant(merchant) before guessing or asking.",
             "If no parseable data: say 'I couldn't find expense details. Please provide: amount, merchant, and card.'",
             "Call add_transaction ONLY after user confirms the final summary.",
         ],
     }
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
+def classify_merchant(merchant: str) -> dict:
+    """
+    Looks up the expense category for a well-known merchant.
+
+    Use this to fill in `category` for `add_transaction` without guessing.
+    Matching is case-insensitive on the start of the name, so "Amazon India"
+    and "Swiggy Instamart order" both resolve.
+
+    Args:
+        merchant: The merchant name as the user gave it (e.g., "Starbucks").
+
+    Returns:
+        dict: 'status' plus the 'category' on success; an error if the
+        merchant is unknown (infer from get_expense_logging_rules instead).
+    """
+    category = infer_merchant_category(merchant)
+    if category is None:
+        return {
+            "status": "error",
+            "message": f"No known category for '{merchant}'. Infer one from get_expense_logging_rules.",
+        }
+    return {"status": "success", "merchant": merchant, "category": category}
+
+
+@mcp.tool(structured_output=False)
 def get_card_addition_guidelines() -> dict:
     """
     **IMPORTANT: Call this tool BEFORE adding any credit card.**
@@ -470,8 +695,14 @@ def get_card_addition_guidelines() -> dict:
 # RESOURCES (MCP Resources - Static Data for LLM)
 # =====================================================================
 
+# Categories are static, so each resource payload is serialized once at import
+# (orjson, as for the database JSON columns; emits UTF-8 like ensure_ascii=False)
+CATEGORIES_JSON = orjson.dumps(load_categories()).decode()
+CATEGORY_NAMES_JSON = orjson.dumps(get_category_names()).decode()
+EXCLUDED_CATEGORIES_JSON = orjson.dumps(get_excluded_category_names()).decode()
+
 
-@mcp.resource("finance://categories")
+@mcp.resource("finance://categories", mime_type="application/json")
 def list_categories() -> str:
     """
     Returns all valid expense categories with their descriptions.
@@ -481,33 +712,25 @@ def list_categories() -> str:
     2. Understand what each category covers (e.g., 'Dining' includes food delivery apps).
     3. Check which categories are typically excluded from rewards.
     """
-    data = load_categories()
-    return json.dumps(data, indent=2)
+    return CATEGORIES_JSON
 
 
-@mcp.resource("finance://categories/names")
+@mcp.resource("finance://categories/names", mime_type="application/json")
 def list_category_names() -> str:
     """
     Returns a simple list of valid category names.
     Use this for quick validation or selection.
     """
-    names = get_category_names()
-    return json.dumps(names)
+    return CATEGORY_NAMES_JSON
 
 
-@mcp.resource("finance://categories/excluded")
+@mcp.resource("finance://categories/excluded", mime_type="application/json")
 def list_excluded_categories() -> str:
     """
     Returns categories that are typically excluded from credit card rewards.
     These include: Insurance, Government, Rent, Wallet Loads, EMI, Jewellery, Cash Advance.
     """
-    data = load_categories()
-    excluded = [
-        cat["name"]
-        for cat in data["categories"]
-        if cat.get("excluded_from_rewards", False)
-    ]
-    return json.dumps(excluded)
+    return EXCLUDED_CATEGORIES_JSON
 
 
 # =====================================================================
@@ -515,7 +738,7 @@ def list_excluded_categories() -> str:
 # =====================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_my_cards() -> dict:
     """
     Retrieves a summary of all credit cards currently stored in the wallet database.
@@ -528,31 +751,44 @@ def get_my_cards() -> dict:
     Returns:
         dict: A dictionary of cards, including their ID, Name, Bank, Limit, and Billing Cycle.
     """
+    cache_key = ("my_cards",)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         with Session(engine) as session:
-            statement = select(CreditCard)
-            cards = session.exec(statement).all()
+            # Only the listed columns, as plain rows (no ORM objects)
+            statement = select(
+                CreditCard.id,
+                CreditCard.name,
+                CreditCard.bank,
+                CreditCard.monthly_limit,
+                CreditCard.base_point_value,
+                CreditCard.billing_cycle_start,
+            )
+            rows = session.exec(statement).all()
 
-            if not cards:
+            if not rows:
                 return "Your wallet is empty. No cards found."
 
             response = {}
-            for card in cards:
-                response[f"{card.name} [ID: {card.id}]"] = {
-                    "bank": card.bank,
-                    "limit": card.monthly_limit,
-                    "base_value": card.base_point_value,
-                    "billing_cycle_start": card.billing_cycle_start,
+            for card_id, name, bank, limit, base_value, billing_day in rows:
+                response[f"{name} [ID: {card_id}]"] = {
+                    "bank": bank,
+                    "limit": limit,
+                    "base_value": base_value,
+                    "billing_cycle_start": billing_day,
                 }
 
+            _cache_put(cache_key, response)
             return response
     except Exception as e:
-        logger.error(f"Error fetching cards: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error fetching cards: {str(e)}")
         return f"Error fetching cards: {str(e)}"
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_transactions(
     limit: int = 5,
     start_date: Optional[str] = None,
@@ -596,7 +832,9 @@ def get_transactions(
             # --- Date Filters ---
             if start_date:
                 try:
-                    s_date = datetime.strptime(start_date, "%Y-%m-%d")
+                    s_date = datetime.combine(
+                        date_type.fromisoformat(start_date), datetime.min.time()
+                    )
                     and_conditions.append(Expense.date >= s_date)
                 except ValueError:
                     return {
@@ -606,7 +844,9 @@ def get_transactions(
 
             if end_date:
                 try:
-                    e_date = datetime.strptime(end_date, "%Y-%m-%d")
+                    e_date = datetime.combine(
+                        date_type.fromisoformat(end_date), datetime.min.time()
+                    )
                     # Set time to end of day to include transactions on that day
                     e_date = e_date.replace(hour=23, minute=59, second=59)
                     and_conditions.append(Expense.date <= e_date)
@@ -676,7 +916,7 @@ def get_transactions(
                 txn_list.append(
                     {
                         "id": txn.id,
-                        "date": txn.date.strftime("%Y-%m-%d"),
+                        "date": txn.date.date().isoformat(),
                         "merchant": txn.merchant,
                         "amount": txn.amount,
                         "category": txn.category,
@@ -693,12 +933,18 @@ def get_transactions(
             }
 
     except Exception as e:
-        logger.error(f"Error fetching transactions: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error fetching transactions: {str(e)}")
         return {"status": "error", "message": f"System error: {str(e)}"}
 
 
-@mcp.tool()
+# Rules and their cap buckets for get_card_rules, fetched with the cards in
+# one query per relationship instead of a lazy load per card and per rule
+CARD_RULE_LOADS = (
+    selectinload(CreditCard.reward_rules).selectinload(RewardRule.cap_bucket),
+)
+
+
+@mcp.tool(structured_output=False)
 def get_card_rules(card_identifier: str) -> dict:
     """
     Retrieves the detailed reward logic (multipliers, caps, and limits) for specific credit cards.
@@ -719,20 +965,28 @@ def get_card_rules(card_identifier: str) -> dict:
         get_card_rules("1") -> Returns rules strictly for Card ID 1.
         get_card_rules("Regalia") -> Returns rules for all cards containing 'Regalia'.
     """
+    # Name matching is case-insensitive, so "hdfc" and "HDFC" share an entry
+    cache_key = ("card_rules", card_identifier.lower())
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         with Session(engine) as session:
-            query = select(CreditCard)
-
             # 1. Determine if input is an ID or a Name
             if card_identifier.isdigit():
-                # Search by exact ID
-                query = query.where(CreditCard.id == int(card_identifier))
+                # Search by exact ID (primary-key lookup, served from the
+                # identity map when the card is already loaded)
+                card = session.get(
+                    CreditCard, int(card_identifier), options=CARD_RULE_LOADS
+                )
+                results = [card] if card else []
             else:
                 # Search by Name (Case-Insensitive Partial Match)
                 # This allows "HDFC" to find both "HDFC Regalia" and "HDFC Infinia"
-                query = query.where(col(CreditCard.name).ilike(f"%{card_identifier}%"))
-
-            results = session.exec(query).all()
+                results = _find_cards_by_name(
+                    session, card_identifier, CARD_RULE_LOADS
+                )
 
             if not results:
                 return {
@@ -783,17 +1037,18 @@ def get_card_rules(card_identifier: str) -> dict:
 
                 output["cards"].append(card_data)
 
+            _cache_put(cache_key, output)
             return output
 
     except Exception as e:
-        return {
-            "status": "error",
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-        }
+        logger.exception(f"Error fetching card rules: {e}")
+        response = {"status": "error", "message": str(e)}
+        if DEBUG_ERRORS:
+            response["traceback"] = traceback.format_exc()
+        return response
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_card_description(card_id: int) -> dict:
     """
     Retrieves the description and key details of a credit card.
@@ -831,7 +1086,7 @@ def get_card_description(card_id: int) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error getting card description: {e}")
+        logger.exception(f"Error getting card description: {e}")
         return {"status": "error", "message": str(e)}
 
 
@@ -840,7 +1095,7 @@ def get_card_description(card_id: int) -> dict:
 # =====================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def add_credit_card(
     name: str,
     bank: str,
@@ -883,11 +1138,10 @@ def add_credit_card(
             }
 
         # Validate network
-        valid_networks = ["Visa", "Mastercard", "RuPay", "Amex", "Diners", "Unknown"]
-        if network not in valid_networks:
+        if network not in VALID_NETWORKS:
             return {
                 "status": "error",
-                "message": f"Invalid network. Must be one of: {valid_networks}",
+                "message": f"Invalid network. Must be one of: {VALID_NETWORKS}",
             }
 
         with Session(engine) as session:
@@ -917,6 +1171,7 @@ def add_credit_card(
 
             session.add(card)
             session.commit()
+            _invalidate_caches()
             session.refresh(card)
 
             logger.info(f"Added credit card: {name} (ID: {card.id})")
@@ -943,12 +1198,11 @@ def add_credit_card(
             }
 
     except Exception as e:
-        logger.error(f"Error adding credit card: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error adding credit card: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def add_reward_rules(card_id: int, rules: list[dict]) -> dict:
     """
     Adds reward rules to an existing credit card. Call this AFTER add_credit_card.
@@ -1040,6 +1294,7 @@ def add_reward_rules(card_id: int, rules: list[dict]) -> dict:
                 )
 
             session.commit()
+            _invalidate_caches()
 
             return {
                 "status": "success",
@@ -1049,12 +1304,11 @@ def add_reward_rules(card_id: int, rules: list[dict]) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error adding reward rules: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error adding reward rules: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def add_cap_buckets(card_id: int, buckets: list[dict]) -> dict:
     """
     Adds cap buckets (spending limits) to an existing credit card.
@@ -1081,9 +1335,6 @@ def add_cap_buckets(card_id: int, buckets: list[dict]) -> dict:
         if not buckets:
             return {"status": "error", "message": "No buckets provided."}
 
-        valid_periods = ["daily", "statement_month", "quarter", "statement_year"]
-        valid_scopes = ["category", "global"]
-
         with Session(engine) as session:
             # Verify card exists
             card = session.get(CreditCard, card_id)
@@ -1109,18 +1360,18 @@ def add_cap_buckets(card_id: int, buckets: list[dict]) -> dict:
 
                 # Validate period
                 period_str = bucket_data.get("period", "statement_month")
-                if period_str not in valid_periods:
+                if period_str not in VALID_PERIODS:
                     return {
                         "status": "error",
-                        "message": f"Invalid period '{period_str}'. Must be one of: {valid_periods}",
+                        "message": f"Invalid period '{period_str}'. Must be one of: {VALID_PERIODS}",
                     }
 
                 # Validate scope
                 scope_str = bucket_data.get("scope", "category")
-                if scope_str not in valid_scopes:
+                if scope_str not in VALID_SCOPES:
                     return {
                         "status": "error",
-                        "message": f"Invalid scope '{scope_str}'. Must be one of: {valid_scopes}",
+                        "message": f"Invalid scope '{scope_str}'. Must be one of: {VALID_SCOPES}",
                     }
 
                 bucket = CapBucket(
@@ -1142,6 +1393,7 @@ def add_cap_buckets(card_id: int, buckets: list[dict]) -> dict:
                 )
 
             session.commit()
+            _invalidate_caches()
 
             return {
                 "status": "success",
@@ -1151,12 +1403,11 @@ def add_cap_buckets(card_id: int, buckets: list[dict]) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error adding cap buckets: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error adding cap buckets: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def add_redemption_partners(card_id: int, partners: list[dict]) -> dict:
     """
     Adds redemption/transfer partners to an existing credit card.
@@ -1228,6 +1479,7 @@ def add_redemption_partners(card_id: int, partners: list[dict]) -> dict:
                 )
 
             session.commit()
+            _invalidate_caches()
 
             return {
                 "status": "success",
@@ -1237,12 +1489,21 @@ def add_redemption_partners(card_id: int, partners: list[dict]) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error adding redemption partners: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error adding redemption partners: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+# Tables holding per-card rows, in a safe deletion order
+CARD_CHILD_MODELS = (
+    Expense,
+    PointAdjustment,
+    RewardRule,
+    CapBucket,
+    RedemptionPartner,
+)
+
+
+@mcp.tool(structured_output=False)
 def delete_credit_card(card_id: int) -> str:
     """
     Permanently deletes a credit card and ALL its associated rules, limits, and history.
@@ -1252,7 +1513,7 @@ def delete_credit_card(card_id: int) -> str:
     - All Reward Rules for this card
     - All Cap Buckets for this card
     - All Redemption Partners for this card
-    - (Expenses might remain as orphans depending on DB settings, but are usually unlinked)
+    - All Expenses and Point Adjustments logged on this card
 
     Args:
         card_id (int): The unique numeric ID of the card (found via 'get_my_cards').
@@ -1271,18 +1532,23 @@ def delete_credit_card(card_id: int) -> str:
             card_limit = card.monthly_limit
             card_bank = card.bank
 
-            # Delete the card (SQLModel/SQLAlchemy usually handles simple deletions,
-            # but note that related rows might need explicit cascading in complex setups.
-            # For this simple setup, we delete the parent.)
-            session.delete(card)
+            # Delete children with one bulk DELETE per table instead of letting
+            # the ORM cascade load every expense/rule/bucket and delete it row
+            # by row. Rules go before the cap buckets they point at.
+            for model in CARD_CHILD_MODELS:
+                session.exec(delete(model).where(model.card_id == card_id))
+            session.exec(delete(CreditCard).where(CreditCard.id == card_id))
             session.commit()
+            _invalidate_caches()
 
             return f"🗑️ Success: Deleted Card '{card_name}' (Limit: ₹{card_limit}, Bank: {card_bank}) [ID: {card_id}] and its configuration."
 
     except Exception as e:
-        return (
-            f"❌ Error executing tool: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-        )
+        logger.exception(f"Error deleting credit card: {e}")
+        message = f"❌ Error executing tool: {str(e)}"
+        if DEBUG_ERRORS:
+            message += f"\n\nTraceback:\n{traceback.format_exc()}"
+        return message
 
 
 # =====================================================================
@@ -1290,7 +1556,7 @@ def delete_credit_card(card_id: int) -> str:
 # =====================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def delete_transaction(transaction_id: int) -> str:
     """
     Permanently removes a specific transaction record from the database.
@@ -1313,23 +1579,26 @@ def delete_transaction(transaction_id: int) -> str:
 
             session.delete(txn)
             session.commit()
+            _invalidate_caches()
 
             return f"🗑️ Success: Deleted transaction '{details}' [ID: {transaction_id}]."
 
     except Exception as e:
-        return (
-            f"❌ Error executing tool: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-        )
+        logger.exception(f"Error deleting transaction: {e}")
+        message = f"❌ Error executing tool: {str(e)}"
+        if DEBUG_ERRORS:
+            message += f"\n\nTraceback:\n{traceback.format_exc()}"
+        return message
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def add_transaction(
     amount: float,
     merchant: str,
-    category: str,
+    category: CategoryName,
     card_name: str,
     platform: str = "Direct",
-    date: Optional[str] = None,
+    date: Optional[date_type] = None,
     is_online: Optional[bool] = None,
 ) -> dict:
     """
@@ -1356,33 +1625,17 @@ def add_transaction(
         if amount <= 0:
             return {"status": "error", "message": "Amount must be positive."}
 
-        # 2. Validate category
-        valid_categories = get_category_names()
-        if category not in valid_categories:
-            return {
-                "status": "error",
-                "message": f"Invalid category '{category}'.",
-                "valid_categories": valid_categories,
-            }
+        # 2. Category is validated against CategoryName before the tool runs
 
-        # 3. Parse date
+        # 3. Resolve date (already parsed from 'YYYY-MM-DD' by argument validation)
         if date:
-            try:
-                transaction_date = datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                return {
-                    "status": "error",
-                    "message": "Invalid date format. Use YYYY-MM-DD.",
-                }
+            transaction_date = datetime.combine(date, datetime.min.time())
         else:
             transaction_date = datetime.now()
 
         # 4. Find the card
         with Session(engine) as session:
-            query = select(CreditCard).where(
-                col(CreditCard.name).ilike(f"%{card_name}%")
-            )
-            cards = session.exec(query).all()
+            cards = _find_cards_by_name(session, card_name)
 
             if not cards:
                 return {
@@ -1403,34 +1656,16 @@ def add_transaction(
             # 5. Infer is_online if not provided (Smart Logic)
             if is_online is None:
                 # A. Check Category
-                if category in [
-                    "Shopping - Online",
-                    "Travel - Flights",
-                    "Travel - Cabs & Rideshare",
-                    "Entertainment",
-                    "Education",
-                ]:
+                if category in ONLINE_CATEGORIES:
                     is_online = True
 
                 # B. Check Merchant (Common Examples)
-                online_merchants = [
-                    "Amazon",
-                    "Flipkart",
-                    "Myntra",
-                    "Uber",
-                    "Ola",
-                    "Swiggy",
-                    "Zomato",
-                    "Netflix",
-                    "Spotify",
-                    "Apple",
-                    "Google",
-                ]
-                if any(m.lower() in merchant.lower() for m in online_merchants):
+                merchant_lower = merchant.lower()
+                if any(m in merchant_lower for m in ONLINE_MERCHANTS):
                     is_online = True
 
                 # C. Check Platform
-                if platform in ["SmartBuy", "Gyftr"]:
+                if platform in ONLINE_PLATFORMS:
                     is_online = True
 
             # 6. Create Expense & Calculate Rewards
@@ -1456,22 +1691,20 @@ def add_transaction(
                 expense.notes = "\n".join(reward_result.breakdown)
 
             session.add(expense)
-            session.commit()
-            session.refresh(expense)
+            # Flush assigns the id; the response is built before commit, while
+            # the instances are still loaded, so nothing has to be re-read
+            # (no refresh, no post-commit reload of expired attributes)
+            session.flush()
 
             # --- Check for Exclusion (for the user warning) ---
-            categories_data = load_categories()
-            is_excluded = any(
-                cat["name"] == category and cat.get("excluded_from_rewards", False)
-                for cat in categories_data["categories"]
-            )
+            is_excluded = category in EXCLUDED_CATEGORIES
 
-            return {
+            response = {
                 "status": "success",
                 "message": "Transaction added successfully.",
                 "transaction": {
                     "id": expense.id,
-                    "date": expense.date.strftime("%Y-%m-%d"),
+                    "date": expense.date.date().isoformat(),
                     "merchant": expense.merchant,
                     "amount": expense.amount,
                     "category": expense.category,
@@ -1486,9 +1719,12 @@ def add_transaction(
                 },
             }
 
+            session.commit()
+            _invalidate_caches()
+            return response
+
     except Exception as e:
-        logger.error(f"Error adding transaction: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error adding transaction: {str(e)}")
         return {"status": "error", "message": str(e)}
 
 
@@ -1497,8 +1733,47 @@ def add_transaction(
 # =====================================================================
 
 
-@mcp.tool()
-def search_card_info(card_name: str, bank: str = "", max_results: int = 15) -> dict:
+def _run_card_queries(query_configs: list[dict], max_results: int) -> list[dict]:
+    """Runs the targeted DDGS queries in priority order, de-duplicating by URL."""
+    all_results = []
+    seen_urls = set()
+
+    with DDGS() as ddgs:
+        for qc in query_configs:
+            if len(all_results) >= max_results:
+                break
+
+            try:
+                # Take top 1-2 results per query to stay focused
+                results = list(ddgs.text(qc["query"], max_results=2))
+                for r in results:
+                    url = r.get("href", "")
+                    if url and url not in seen_urls:
+                        seen_urls.add(url)
+                        all_results.append(
+                            {
+                                "title": r.get("title", ""),
+                                "snippet": r.get("body", ""),
+                                "url": url,
+                                "category": qc["category"],
+                                "is_pdf": url.lower().endswith(".pdf"),
+                            }
+                        )
+            except Exception as e:
+                logger.warning(f"Query failed: {qc['query'][:50]}... - {e}")
+                continue
+
+    return all_results
+
+
+def _run_text_search(query: str, max_results: int) -> list[dict]:
+    """Runs a single blocking DDGS text search."""
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, max_results=max_results))
+
+
+@mcp.tool(structured_output=False)
+async def search_card_info(card_name: str, bank: str = "", max_results: int = 15) -> dict:
     """
     Searches the web for credit card reward information using targeted DuckDuckGo queries.
     Focuses on official docs (MITC/KFS/T&Cs), reviewers, and community sources.
@@ -1522,33 +1797,10 @@ def search_card_info(card_name: str, bank: str = "", max_results: int = 15) -> d
         # Sort by priority
         query_configs.sort(key=lambda x: x["priority"])
 
-        all_results = []
-        seen_urls = set()
-
-        with DDGS() as ddgs:
-            for qc in query_configs:
-                if len(all_results) >= max_results:
-                    break
-
-                try:
-                    # Take top 1-2 results per query to stay focused
-                    results = list(ddgs.text(qc["query"], max_results=2))
-                    for r in results:
-                        url = r.get("href", "")
-                        if url and url not in seen_urls:
-                            seen_urls.add(url)
-                            all_results.append(
-                                {
-                                    "title": r.get("title", ""),
-                                    "snippet": r.get("body", ""),
-                                    "url": url,
-                                    "category": qc["category"],
-                                    "is_pdf": url.lower().endswith(".pdf"),
-                                }
-                            )
-                except Exception as e:
-                    logger.warning(f"Query failed: {qc['query'][:50]}... - {e}")
-                    continue
+        # DDGS is blocking network I/O - keep it off the event loop
+        all_results = await anyio.to_thread.run_sync(
+            _run_card_queries, query_configs, max_results
+        )
 
         if not all_results:
             return {
@@ -1612,15 +1864,15 @@ def search_card_info(card_name: str, bank: str = "", max_results: int = 15) -> d
         }
 
     except Exception as e:
-        logger.error(f"Error searching for card info: {e}")
+        logger.exception(f"Error searching for card info: {e}")
         return {
             "status": "error",
             "message": f"Search failed: {str(e)}. You may need to add rules manually.",
         }
 
 
-@mcp.tool()
-def custom_web_search(query: str, max_results: int = 5) -> dict:
+@mcp.tool(structured_output=False)
+async def custom_web_search(query: str, max_results: int = 5) -> dict:
     """
     Performs a custom web search for specific credit card information.
 
@@ -1639,29 +1891,28 @@ def custom_web_search(query: str, max_results: int = 5) -> dict:
         dict: Search results with title, snippet, and URL.
     """
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
+        results = await anyio.to_thread.run_sync(_run_text_search, query, max_results)
 
-            formatted = []
-            for r in results:
-                formatted.append(
-                    {
-                        "title": r.get("title", ""),
-                        "snippet": r.get("body", ""),
-                        "url": r.get("href", ""),
-                        "is_pdf": r.get("href", "").lower().endswith(".pdf"),
-                    }
-                )
+        formatted = []
+        for r in results:
+            formatted.append(
+                {
+                    "title": r.get("title", ""),
+                    "snippet": r.get("body", ""),
+                    "url": r.get("href", ""),
+                    "is_pdf": r.get("href", "").lower().endswith(".pdf"),
+                }
+            )
 
-            return {
-                "status": "success",
-                "query": query,
-                "count": len(formatted),
-                "results": formatted,
-            }
+        return {
+            "status": "success",
+            "query": query,
+            "count": len(formatted),
+            "results": formatted,
+        }
 
     except Exception as e:
-        logger.error(f"Custom search failed: {e}")
+        logger.exception(f"Custom search failed: {e}")
         return {"status": "error", "message": str(e)}
 
 
@@ -1670,7 +1921,7 @@ def custom_web_search(query: str, max_results: int = 5) -> dict:
 # =====================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_reward_balance(card_name: str) -> dict:
     """
     Checks the current accumulated reward points for a specific card.
@@ -1683,10 +1934,7 @@ def get_reward_balance(card_name: str) -> dict:
     """
     try:
         with Session(engine) as session:
-            query = select(CreditCard).where(
-                col(CreditCard.name).ilike(f"%{card_name}%")
-            )
-            cards = session.exec(query).all()
+            cards = _find_cards_by_name(session, card_name)
 
             if not cards:
                 return {"status": "error", "message": f"Card '{card_name}' not found."}
@@ -1765,11 +2013,11 @@ def get_reward_balance(card_name: str) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error getting reward balance: {e}")
+        logger.exception(f"Error getting reward balance: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def adjust_reward_points(
     card_name: str,
     points: float,
@@ -1792,26 +2040,15 @@ def adjust_reward_points(
     """
     try:
         # Validate adjustment type
-        valid_types = [
-            "redemption",
-            "signup_bonus",
-            "referral",
-            "promo",
-            "correction",
-            "expiration",
-        ]
-        if adjustment_type not in valid_types:
+        if adjustment_type not in VALID_ADJUSTMENT_TYPES:
             return {
                 "status": "error",
-                "message": f"Invalid adjustment_type. Must be one of: {valid_types}",
+                "message": f"Invalid adjustment_type. Must be one of: {VALID_ADJUSTMENT_TYPES}",
             }
 
         with Session(engine) as session:
             # Find the card
-            query = select(CreditCard).where(
-                col(CreditCard.name).ilike(f"%{card_name}%")
-            )
-            cards = session.exec(query).all()
+            cards = _find_cards_by_name(session, card_name)
 
             if not cards:
                 return {"status": "error", "message": f"Card '{card_name}' not found."}
@@ -1835,6 +2072,7 @@ def adjust_reward_points(
             )
             session.add(adjustment)
             session.commit()
+            _invalidate_caches()
             session.refresh(adjustment)
 
             # Calculate new balance
@@ -1877,11 +2115,11 @@ def adjust_reward_points(
             }
 
     except Exception as e:
-        logger.error(f"Error adjusting points: {e}")
+        logger.exception(f"Error adjusting points: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_points_history(limit: int = 20) -> dict:
     """
     Shows unified points history: both earned (from transactions) and adjustments (redemptions, bonuses).
@@ -1965,8 +2203,7 @@ def get_points_history(limit: int = 20) -> dict:
             }
 
     except Exception as e:
-        logger.error(f"Error fetching points history: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error fetching points history: {e}")
         return {"status": "error", "message": str(e)}
 
 
@@ -1975,7 +2212,7 @@ def get_points_history(limit: int = 20) -> dict:
 # =====================================================================
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def get_best_card_for_purchase(
     amount: float,
     merchant: str,
@@ -1999,6 +2236,11 @@ def get_best_card_for_purchase(
     Returns:
         dict containing recommendations and guidelines for interpreting/presenting results.
     """
+    cache_key = ("best_card", amount, merchant, category, platform)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         with Session(engine) as session:
             results = recommend_all_cards(
@@ -2031,7 +2273,7 @@ def get_best_card_for_purchase(
                     }
                 )
 
-            return {
+            response = {
                 "status": "success",
                 "purchase": f"₹{amount:,.0f} {merchant} ({category})",
                 "recommendation_count": len(results),
@@ -2081,13 +2323,15 @@ def get_best_card_for_purchase(
                     "Use quick_comparison for formatted display when user asks to compare cards",
                 ],
             }
+            _cache_put(cache_key, response)
+            return response
 
     except Exception as e:
-        logger.error(f"Error in card recommendation: {e}")
+        logger.exception(f"Error in card recommendation: {e}")
         return {"status": "error", "message": str(e)}
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def analyze_expenses(
     period: str = "month",
     start_date: Optional[str] = None,
@@ -2117,8 +2361,8 @@ def analyze_expenses(
             today = datetime.now().date()
 
             if start_date and end_date:
-                start = datetime.strptime(start_date, "%Y-%m-%d").date()
-                end = datetime.strptime(end_date, "%Y-%m-%d").date()
+                start = date_type.fromisoformat(start_date)
+                end = date_type.fromisoformat(end_date)
                 period_label = f"{start_date} to {end_date}"
             else:
                 if period == "week":
@@ -2273,9 +2517,14 @@ def analyze_expenses(
             }
 
     except Exception as e:
-        logger.error(f"Error analyzing expenses: {e}")
+        logger.exception(f"Error analyzing expenses: {e}")
         return {"status": "error", "message": str(e)}
 
 
 if __name__ == "__main__":
-    mcp.run()
+    try:
+        import uvloop  # noqa: F401 - optional speedup, not available on Windows
+    except ImportError:
+        mcp.run()
+    else:
+        anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": True})
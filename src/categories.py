@@ -0,0 +1,75 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+# Single source of truth for expense categories, shared by the server,
+# the rewards engine and the seed script
+CATEGORIES_FILE = Path(__file__).resolve().parent.parent / "data" / "categories.json"
+
+
+@lru_cache(maxsize=1)
+def load_categories() -> dict:
+    """Load categories from JSON file (parsed once per process; treat as read-only)."""
+    with open(CATEGORIES_FILE, "r") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=1)
+def get_category_names() -> tuple[str, ...]:
+    """Get valid category names (built once, in categories.json order)."""
+    return tuple(cat["name"] for cat in load_categories()["categories"])
+
+
+@lru_cache(maxsize=1)
+def get_excluded_category_names() -> tuple[str, ...]:
+    """Get categories flagged excluded_from_rewards, in categories.json order."""
+    return tuple(
+        cat["name"]
+        for cat in load_categories()["categories"]
+        if cat.get("excluded_from_rewards", False)
+    )
+
+
+# Known merchants -> category, for deterministic classification
+MERCHANT_CATEGORIES_FILE = (
+    Path(__file__).resolve().parent.parent / "data" / "merchant_categories.json"
+)
+
+
+@lru_cache(maxsize=1)
+def load_merchant_categories() -> dict[str, str]:
+    """
+    Load the merchant -> category map (keys casefolded).
+    Entries pointing at unknown categories are dropped.
+    """
+    try:
+        with open(MERCHANT_CATEGORIES_FILE, "r") as f:
+            merchants = json.load(f).get("merchants", {})
+    except (OSError, ValueError):
+        return {}
+
+    valid = frozenset(get_category_names())
+    return {
+        name.casefold(): category
+        for name, category in merchants.items()
+        if category in valid
+    }
+
+
+@lru_cache(maxsize=1024)
+def infer_merchant_category(merchant: str) -> Optional[str]:
+    """
+    Category for a merchant name, or None if it isn't a known merchant.
+
+    Matches the longest known name at the start of the merchant, word by
+    word, so "Amazon India" -> "amazon" but "Amazon Pay Balance" wins over
+    "amazon" for the wallet top-up. Costs one dict probe per word.
+    """
+    merchants = load_merchant_categories()
+    words = merchant.casefold().split()
+    for n in range(len(words), 0, -1):
+        category = merchants.get(" ".join(words[:n]))
+        if category is not None:
+            return category
+    return None
@@ -1,3 +1,5 @@
+import orjson
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.models import CapBucket, CreditCard, Expense, RedemptionPartner, RewardRule
@@ -8,21 +10,65 @@ sqlite_url = f"sqlite:///{sqlite_file_name}"
 
 # 2. The Engine
 # check_same_thread=False is needed for SQLite when using it with web servers/MCP
-engine = create_engine(sqlite_url, connect_args={"check_same_thread": False})
+# JSON columns (tier_status, match_conditions) are encoded/decoded with orjson
+engine = create_engine(
+    sqlite_url,
+    connect_args={"check_same_thread": False},
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+)
 
 
-# 3. The Initialization Function
+# 3. Connection Tuning
+# WAL lets readers run alongside the writer, and with synchronous=NORMAL a
+# commit no longer waits on an fsync (the WAL is synced at checkpoints).
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.close()
+
+
+# 4. The Initialization Function
 def create_db_and_tables():
     """
     Creates the database file and all tables defined in src.models.
     Run this once when you set up the project or change the schema.
+
+    Safe to call on every startup: if all tables and indexes already exist
+    it returns after a single catalog lookup instead of probing each table
+    for DDL. Indexes added to the models later are created on existing
+    databases too.
     """
+    with engine.connect() as conn:
+        existing = set(
+            conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+            ).scalars()
+        )
+    tables = SQLModel.metadata.tables
+    missing_indexes = [
+        index
+        for table in tables.values()
+        for index in table.indexes
+        if index.name not in existing
+    ]
+    if existing.issuperset(tables) and not missing_indexes:
+        return
+
     # This magic line looks at all SQLModel classes imported above
     # and generates the standard SQL 'CREATE TABLE' commands.
     SQLModel.metadata.create_all(engine)
 
+    # create_all skips tables that already exist, indexes included
+    for index in missing_indexes:
+        index.create(engine, checkfirst=True)
+
 
-# 4. Helper to get a session (Optional but useful for scripts)
+# 5. Helper to get a session (Optional but useful for scripts)
 def get_session():
     with Session(engine) as session:
         yield session
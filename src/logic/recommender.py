@@ -95,15 +95,20 @@ result['rank']                         → 1 = best, 2 = second best, etc.
 ================================================================================
 """
 
-from dataclasses import dataclass, field
+from dataclasses import astuple, dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import lambda_stmt
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
 from src.logic.rewards import RewardsEngine
 from src.models import CreditCard, Expense, RewardRule
 
+# (partner name, transfer ratio, INR per transferred point)
+PartnerRate = Tuple[str, float, float]
+
 
 @dataclass
 class RedemptionOption:
@@ -216,6 +221,11 @@ class CardRecommender:
     def __init__(self, session: Session):
         self.session = session
         self.engine = RewardsEngine(session)
+        # (card ids, request fields) -> ranked recommendations, so repeated
+        # queries on this recommender skip re-analyzing every card
+        self._ranked: Dict[tuple, List[CardRecommendation]] = {}
+        # card.id -> redemption rate table
+        self._partner_rates: Dict[int, Tuple[PartnerRate, ...]] = {}
 
     def recommend_for_expense(
         self,
@@ -224,16 +234,18 @@ class CardRecommender:
         category: str,
         platform: str = "Direct",
         is_online: Optional[bool] = None,
+        cards: Optional[List[CreditCard]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Main entry point: Fetch all cards, calculate rewards, return ranked results.
 
+        Pass `cards` (e.g. from load_all_cards) to reuse an already loaded
+        card list across many calls instead of querying each time.
+
         Returns list of dictionaries sorted by best_redemption_value DESC.
         """
-        cards = self._fetch_all_cards()
-
-        if not cards:
-            return []
+        if cards is None:
+            cards = self._fetch_all_cards()
 
         request = RecommendationRequest(
             amount=amount,
@@ -242,18 +254,23 @@ class CardRecommender:
             platform=platform,
             is_online=is_online,
         )
+        return self._rank_cards(cards, request)
 
-        recommendations = []
-        for card in cards:
-            rec = self._analyze_card(card, request)
-            recommendations.append(rec)
-
-        recommendations.sort(key=lambda r: r.best_redemption_value, reverse=True)
-
-        for i, rec in enumerate(recommendations):
-            rec.rank = i + 1
+    def recommend_batch(
+        self,
+        requests: List[RecommendationRequest],
+        cards: Optional[List[CreditCard]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Ranked results for many transactions in one pass.
 
-        return [rec.to_dict() for rec in recommendations]
+        Cards are fetched once and every request shares this recommender's
+        engine, so rule indexes and cap usage sums are built only once.
+        Returns one ranked list per request, in request order.
+        """
+        if cards is None:
+            cards = self._fetch_all_cards()
+        return [self._rank_cards(cards, request) for request in requests]
 
     def get_best_card(
         self,
@@ -261,15 +278,43 @@ class CardRecommender:
         merchant: str,
         category: str,
         platform: str = "Direct",
+        cards: Optional[List[CreditCard]] = None,
     ) -> Optional[Dict[str, Any]]:
         """Convenience method to get just the top recommendation as dict."""
-        results = self.recommend_for_expense(amount, merchant, category, platform)
+        results = self.recommend_for_expense(
+            amount, merchant, category, platform, cards=cards
+        )
         return results[0] if results else None
 
+    def _rank_cards(
+        self,
+        cards: List[CreditCard],
+        request: RecommendationRequest,
+    ) -> List[Dict[str, Any]]:
+        """Analyze every card for the request and return them ranked."""
+        if not cards:
+            return []
+
+        key = (tuple(card.id for card in cards), astuple(request))
+        recommendations = self._ranked.get(key)
+        if recommendations is None:
+            recommendations = []
+            for card in cards:
+                rec = self._analyze_card(card, request)
+                recommendations.append(rec)
+
+            recommendations.sort(key=lambda r: r.best_redemption_value, reverse=True)
+
+            for i, rec in enumerate(recommendations):
+                rec.rank = i + 1
+            self._ranked[key] = recommendations
+
+        # The memo holds the recommendation objects; dicts are rebuilt per call
+        return [rec.to_dict() for rec in recommendations]
+
     def _fetch_all_cards(self) -> List[CreditCard]:
         """Fetch all credit cards from the database."""
-        statement = select(CreditCard)
-        return list(self.session.exec(statement).all())
+        return load_all_cards(self.session)
 
     def _analyze_card(
         self,
@@ -299,7 +344,12 @@ class CardRecommender:
 
         best_option = max(redemption_options, key=lambda x: x.cash_value) if redemption_options else None
 
-        cap_headroom = self._calculate_cap_headroom(card, matched_rule)
+        # Excluded spends earn nothing, so there is no cap to report on
+        cap_headroom = (
+            None
+            if reward_result.is_excluded
+            else self._calculate_cap_headroom(card, matched_rule)
+        )
         cap_warning = None
         if cap_headroom is not None and cap_headroom < 20:
             cap_warning = f"Warning: Only {cap_headroom:.0f}% cap remaining"
@@ -357,31 +407,31 @@ class CardRecommender:
         total_points: float,
     ) -> List[RedemptionOption]:
         """Calculate cash value for each redemption partner."""
-        options = []
-
-        options.append(
+        return [
             RedemptionOption(
-                partner_name="Direct Cashback",
-                transfer_ratio=1.0,
-                point_value=card.base_point_value,
-                cash_value=total_points * card.base_point_value,
+                partner_name=name,
+                transfer_ratio=ratio,
+                point_value=point_value,
+                cash_value=total_points * ratio * point_value,
             )
-        )
+            for name, ratio, point_value in self._get_partner_rates(card)
+        ]
 
-        for partner in card.redemption_partners:
-            transferred_points = total_points * partner.transfer_ratio
-            cash_value = transferred_points * partner.estimated_value
-
-            options.append(
-                RedemptionOption(
-                    partner_name=partner.partner_name,
-                    transfer_ratio=partner.transfer_ratio,
-                    point_value=partner.estimated_value,
-                    cash_value=cash_value,
-                )
+    def _get_partner_rates(self, card: CreditCard) -> Tuple[PartnerRate, ...]:
+        """
+        The card's redemption paths as plain (name, ratio, point value)
+        tuples, Direct Cashback first. They are card-static, so they are read
+        off the ORM objects once per card and only scaled per transaction.
+        """
+        rates = self._partner_rates.get(card.id)
+        if rates is None:
+            rates = (("Direct Cashback", 1.0, card.base_point_value),) + tuple(
+                (p.partner_name, p.transfer_ratio, p.estimated_value)
+                for p in card.redemption_partners
             )
-
-        return options
+            if card.id is not None:
+                self._partner_rates[card.id] = rates
+        return rates
 
     def _calculate_cap_headroom(
         self,
@@ -410,12 +460,30 @@ class CardRecommender:
         return max(0.0, 100.0 - used_pct)
 
 
+def load_all_cards(session: Session) -> List[CreditCard]:
+    """
+    Fetch all cards with everything the recommender reads eager-loaded.
+
+    Rules (and their cap buckets), cap buckets and redemption partners come
+    in one SELECT per relationship instead of lazy loads per card.
+    """
+    statement = lambda_stmt(
+        lambda: select(CreditCard).options(
+            selectinload(CreditCard.reward_rules).selectinload(RewardRule.cap_bucket),
+            selectinload(CreditCard.cap_buckets),
+            selectinload(CreditCard.redemption_partners),
+        )
+    )
+    return list(session.execute(statement).scalars().all())
+
+
 def recommend_card(
     session: Session,
     amount: float,
     merchant: str,
     category: str,
     platform: str = "Direct",
+    cards: Optional[List[CreditCard]] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Convenience function: Find the best card for a transaction.
@@ -426,7 +494,26 @@ def recommend_card(
             print(f"Use {best['card_name']} for {best['points']['total']} pts")
     """
     recommender = CardRecommender(session)
-    return recommender.get_best_card(amount, merchant, category, platform)
+    return recommender.get_best_card(amount, merchant, category, platform, cards=cards)
+
+
+def recommend_all_cards_batch(
+    session: Session,
+    requests: List[RecommendationRequest],
+    cards: Optional[List[CreditCard]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Get ranked recommendations for several transactions at once.
+
+    Example:
+        batch = recommend_all_cards_batch(session, [
+            RecommendationRequest(5000, "Amazon", "Shopping", "Amazon"),
+            RecommendationRequest(2000, "Swiggy", "Food Delivery", "Swiggy"),
+        ])
+        amazon_results, swiggy_results = batch
+    """
+    recommender = CardRecommender(session)
+    return recommender.recommend_batch(requests, cards=cards)
 
 
 def recommend_all_cards(
@@ -435,6 +522,7 @@ def recommend_all_cards(
     merchant: str,
     category: str,
     platform: str = "Direct",
+    cards: Optional[List[CreditCard]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Get ranked recommendations for all cards.
@@ -445,4 +533,6 @@ def recommend_all_cards(
             print(f"{r['rank']}. {r['card_name']}: ₹{r['cash_value']['best_value']}")
     """
     recommender = CardRecommender(session)
-    return recommender.recommend_for_expense(amount, merchant, category, platform)
+    return recommender.recommend_for_expense(
+        amount, merchant, category, platform, cards=cards
+    )
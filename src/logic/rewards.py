@@ -1,12 +1,14 @@
-import json
 from calendar import monthrange
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
 
+from sqlalchemy import lambda_stmt
 from sqlmodel import Session, func, select
 
+from src.categories import get_excluded_category_names, load_categories
 from src.models import (
     BucketScope,
     CreditCard,
@@ -16,6 +18,106 @@ from src.models import (
 )
 
 
+ConditionPredicate = Callable[[CreditCard, Expense], bool]
+
+
+def _compile_conditions(conditions: dict[str, str]) -> ConditionPredicate:
+    """
+    Lowers a rule's match_conditions dict into a predicate.
+
+    The dict is parsed once (e.g. "true" -> True) so evaluating the rule
+    against a card/expense is just a couple of comparisons. Predicates are
+    shared process-wide: rules with the same conditions (and every engine
+    built for a new request) reuse one compiled closure.
+
+    Supports:
+    - Card tier conditions: {"membership": "prime"}
+    - Expense conditions: {"is_online": "true"} (a JSON boolean works too)
+
+    Conditions with unhashable values (e.g. a list stored through
+    add_reward_rules) can't be cache keys; they get their own closure.
+    """
+    items = tuple(conditions.items())
+    try:
+        return _compile_condition_items(items)
+    except TypeError:  # unhashable value
+        return _build_condition_predicate(items)
+
+
+@lru_cache(maxsize=256)
+def _compile_condition_items(items: Tuple[Tuple[str, Any], ...]) -> ConditionPredicate:
+    return _build_condition_predicate(items)
+
+
+def _build_condition_predicate(
+    items: Tuple[Tuple[str, Any], ...],
+) -> ConditionPredicate:
+    required_online: Optional[bool] = None
+    tier_requirements = []
+    for key, value in items:
+        if key == "is_online":
+            required_online = str(value).lower() == "true"
+        else:
+            tier_requirements.append((key, value))
+    tier_requirements = tuple(tier_requirements)
+
+    # Fast path: an online/offline-only rule is a single flag check
+    # (None counts as offline)
+    if not tier_requirements:
+        if required_online is None:
+            return lambda card, expense: True
+        return lambda card, expense: bool(expense.is_online) == required_online
+
+    def matches(card: CreditCard, expense: Expense) -> bool:
+        # Expense-level condition (None counts as offline)
+        if required_online is not None and bool(expense.is_online) != required_online:
+            return False
+        # Card tier conditions
+        tier_status = card.tier_status or {}
+        return all(tier_status.get(key) == value for key, value in tier_requirements)
+
+    return matches
+
+
+FALLBACK_CATEGORIES = frozenset({"Base", "All Spends", "General", "Any"})
+
+
+@lru_cache(maxsize=1024)
+def _lookup_key(value: str) -> str:
+    """
+    Lowercased form of a category/merchant/platform name.
+
+    Rule index keys and expense probes both go through here, so repeated
+    names are lowered once. Not interned: merchants and platforms come from
+    user input, and interned strings would outlive the cache eviction.
+    """
+    return value.lower()
+
+
+class RuleRow(NamedTuple):
+    """
+    Plain snapshot of the rule fields the matching loop reads.
+
+    Rule selection runs over these instead of RewardRule instances, so it
+    never goes through the ORM's instrumented attribute descriptors.
+    """
+
+    total_multiplier: float  # base_multiplier + bonus_multiplier
+    condition: Optional[ConditionPredicate]  # None = unconditional
+    rule: RewardRule  # Returned to the caller once selected
+
+
+@dataclass
+class RuleIndex:
+    """Per-card lookup tables over reward_rules, built once per engine."""
+
+    by_name: dict[str, List[RuleRow]]  # category.lower() -> rules
+    by_category: dict[str, List[RuleRow]]  # alias-resolved category -> rules
+    fallback: List[RuleRow]  # Base / All Spends / General / Any
+    by_exact: dict[str, RewardRule]  # exact category -> first rule (overrides)
+    has_conditional: bool = False  # Any rule with match_conditions?
+
+
 @dataclass
 class RewardResult:
     """Standardized output for the rewards engine."""
@@ -25,6 +127,7 @@ class RewardResult:
     bonus_points: float = 0.0
     breakdown: List[str] = field(default_factory=list)
     is_capped: bool = False
+    is_excluded: bool = False  # Globally excluded with no card override
 
 
 class RewardsEngine:
@@ -50,56 +153,52 @@ class RewardsEngine:
 
     def __init__(self, session: Session):
         self.session = session
+        # Loaded once per process and shared by every engine instance
         self.GLOBAL_EXCLUSIONS = self._load_exclusions()
         self.CATEGORY_ALIASES = self._load_category_aliases()
-
-    def _load_exclusions(self) -> List[str]:
+        # card.id -> rule lookup tables
+        self._rule_indexes: dict[int, RuleIndex] = {}
+        # (scope, card/bucket id, start, end) -> summed points_earned
+        self._usage_cache: dict[tuple, float] = {}
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_exclusions() -> frozenset[str]:
         """
         Loads excluded categories from data/categories.json.
         These categories typically earn 0 rewards unless a card has a specific override.
+        Returned as a frozenset: it is probed once per calculate_rewards call.
         """
         try:
-            root_dir = Path(__file__).resolve().parent.parent.parent
-            json_path = root_dir / "data" / "categories.json"
-
-            with open(json_path, "r") as f:
-                data = json.load(f)
-
-            return [
-                cat["name"]
-                for cat in data.get("categories", [])
-                if cat.get("excluded_from_rewards", False)
-            ]
+            return frozenset(get_excluded_category_names())
         except Exception as e:
             print(f"Error loading exclusions: {e}")
-            return [
-                "Rent",
-                "Wallet & Prepaid Loads",
-                "Insurance",
-                "Government Services",
-                "EMI",
-                "Interest",
-                "Cash Advance",
-            ]
+            return frozenset(
+                {
+                    "Rent",
+                    "Wallet & Prepaid Loads",
+                    "Insurance",
+                    "Government Services",
+                    "EMI",
+                    "Interest",
+                    "Cash Advance",
+                }
+            )
 
-    def _load_category_aliases(self) -> dict[str, str]:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_category_aliases() -> dict[str, str]:
         """
         Loads category aliases from data/categories.json.
         Returns a mapping of alias -> canonical name (lowercased).
         e.g., {"bill payments": "utilities", "bills": "utilities"}
         """
         try:
-            root_dir = Path(__file__).resolve().parent.parent.parent
-            json_path = root_dir / "data" / "categories.json"
-
-            with open(json_path, "r") as f:
-                data = json.load(f)
-
             alias_map = {}
-            for cat in data.get("categories", []):
-                canonical = cat["name"].lower()
+            for cat in load_categories().get("categories", []):
+                canonical = _lookup_key(cat["name"])
                 for alias in cat.get("aliases", []):
-                    alias_map[alias.lower()] = canonical
+                    alias_map[_lookup_key(alias)] = canonical
             return alias_map
         except Exception as e:
             print(f"Error loading category aliases: {e}")
@@ -110,7 +209,7 @@ class RewardsEngine:
         Resolves a category to its canonical name using aliases.
         If no alias found, returns the original (lowercased).
         """
-        category_lower = category.lower()
+        category_lower = _lookup_key(category)
         return self.CATEGORY_ALIASES.get(category_lower, category_lower)
 
     def calculate_rewards(self, expense: Expense) -> RewardResult:
@@ -129,6 +228,7 @@ class RewardsEngine:
             result.breakdown.append(
                 f"Category '{expense.category}' is globally excluded."
             )
+            result.is_excluded = True
             return result
 
         # GATE 2: Global Cap Check (Annual → Quarterly → Monthly)
@@ -177,13 +277,22 @@ class RewardsEngine:
         self, card_id: int, start_date: datetime, end_date: datetime
     ) -> float:
         """Sum ALL points earned by the card in the period."""
-        statement = select(func.sum(Expense.points_earned)).where(
-            Expense.card_id == card_id,
-            Expense.date >= start_date,
-            Expense.date <= end_date,
+        key = ("card", card_id, start_date, end_date)
+        if key in self._usage_cache:
+            return self._usage_cache[key]
+
+        # lambda_stmt: the statement is built and cache-keyed once per process;
+        # later calls only swap in the bound values
+        statement = lambda_stmt(
+            lambda: select(func.sum(Expense.points_earned)).where(
+                Expense.card_id == card_id,
+                Expense.date >= start_date,
+                Expense.date <= end_date,
+            )
         )
-        result = self.session.exec(statement).first()
-        return result if result else 0.0
+        result = self.session.execute(statement).scalar()
+        self._usage_cache[key] = usage = result if result else 0.0
+        return usage
 
     def _check_exclusions(
         self, card: CreditCard, expense: Expense
@@ -197,15 +306,9 @@ class RewardsEngine:
         if expense.category not in self.GLOBAL_EXCLUSIONS:
             return False, None
 
-        query = select(RewardRule).where(
-            RewardRule.card_id == card.id, RewardRule.category == expense.category
-        )
-        rule = self.session.exec(query).first()
-
-        if rule:
-            return True, rule
-
-        return True, None
+        # Override = the card's rule for this exact category (no query needed)
+        rule = self._get_rule_index(card).by_exact.get(expense.category)
+        return True, rule
 
     def _calculate_waterfall(
         self,
@@ -297,77 +400,71 @@ class RewardsEngine:
 
         Then filters by tier matching and returns highest multiplier.
         """
-        rules = card.reward_rules
+        index = self._get_rule_index(card)
         candidates = []
 
         # Merchant Match
-        for r in rules:
-            if r.category.lower() == expense.merchant.lower():
-                candidates.append(r)
+        candidates.extend(index.by_name.get(_lookup_key(expense.merchant), ()))
 
         # Platform Match
-        for r in rules:
-            if r.category.lower() == expense.platform.lower():
-                candidates.append(r)
+        candidates.extend(index.by_name.get(_lookup_key(expense.platform), ()))
 
         # Category Match (with alias resolution)
         normalized_expense_category = self._normalize_category(expense.category)
-        for r in rules:
-            normalized_rule_category = self._normalize_category(r.category)
-            if normalized_rule_category == normalized_expense_category:
-                candidates.append(r)
+        candidates.extend(index.by_category.get(normalized_expense_category, ()))
 
         # Fallback
-        for r in rules:
-            if r.category in ["Base", "All Spends", "General", "Any"]:
-                candidates.append(r)
-
-        # Filter by condition matching (tier + expense properties like is_online)
-        if candidates:
-            condition_matched = [
-                r for r in candidates if self._matches_conditions(r, card, expense)
+        candidates.extend(index.fallback)
+
+        # Filter by condition matching (tier + expense properties like is_online).
+        # Unconditional rules always match, so only conditional ones are
+        # evaluated - and cards without any skip the filter altogether.
+        if index.has_conditional:
+            candidates = [
+                row
+                for row in candidates
+                if row.condition is None or row.condition(card, expense)
             ]
-            if condition_matched:
-                candidates = condition_matched
-            else:
-                # Fall back to rules without any conditions
-                candidates = [r for r in candidates if r.match_conditions is None]
 
         if not candidates:
             return None
 
-        return max(candidates, key=lambda r: r.base_multiplier + r.bonus_multiplier)
+        return max(candidates, key=itemgetter(0)).rule
 
-    def _matches_conditions(
-        self, rule: RewardRule, card: CreditCard, expense: Expense
-    ) -> bool:
+    def _get_rule_index(self, card: CreditCard) -> RuleIndex:
         """
-        Check if rule's match_conditions match card tier_status AND expense properties.
-        Universal rules (match_conditions=None) match all.
-
-        Supports:
-        - Card tier conditions: {"membership": "prime"}
-        - Expense conditions: {"is_online": "true"}
+        Returns the card's rules bucketed by lookup key, so matching an
+        expense is a few dict probes instead of four scans over every rule.
+        Buckets keep the card's rule order, preserving tie-breaks in max().
         """
-        if rule.match_conditions is None:
-            return True
-
-        tier_status = card.tier_status or {}
-
-        for key, value in rule.match_conditions.items():
-            # Check expense-level conditions
-            if key == "is_online":
-                expense_is_online = (
-                    expense.is_online if expense.is_online is not None else False
-                )
-                required_online = value.lower() == "true"
-                if expense_is_online != required_online:
-                    return False
-            # Check card tier conditions
-            elif tier_status.get(key) != value:
-                return False
-
-        return True
+        index = self._rule_indexes.get(card.id)
+        if index is not None:
+            return index
+
+        index = RuleIndex(by_name={}, by_category={}, fallback=[], by_exact={})
+        for r in card.reward_rules:
+            category = r.category
+            conditions = r.match_conditions
+            row = RuleRow(
+                total_multiplier=r.base_multiplier + r.bonus_multiplier,
+                condition=(
+                    _compile_conditions(conditions) if conditions is not None else None
+                ),
+                rule=r,
+            )
+            index.by_exact.setdefault(category, r)
+            index.by_name.setdefault(_lookup_key(category), []).append(row)
+            index.by_category.setdefault(
+                self._normalize_category(category), []
+            ).append(row)
+            if category in FALLBACK_CATEGORIES:
+                index.fallback.append(row)
+            if conditions is not None:
+                index.has_conditional = True
+
+        if card.id is not None:
+            self._rule_indexes[card.id] = index
+        return index
 
     def _get_bucket_usage(
         self, bucket_id: int, start_date: datetime, end_date: datetime
@@ -376,16 +473,30 @@ class RewardsEngine:
         Sum points earned via rules linked to this bucket.
         Multiple rules can share a bucket (e.g., Dining + Food Delivery → Food Cap).
         """
-        statement = select(func.sum(Expense.points_earned)).where(
-            Expense.date >= start_date,
-            Expense.date <= end_date,
-            Expense.applied_rule_id.in_(
-                select(RewardRule.id).where(RewardRule.cap_bucket_id == bucket_id)
-            ),
+        key = ("bucket", bucket_id, start_date, end_date)
+        if key in self._usage_cache:
+            return self._usage_cache[key]
+
+        statement = lambda_stmt(
+            lambda: select(func.sum(Expense.points_earned)).where(
+                Expense.date >= start_date,
+                Expense.date <= end_date,
+                Expense.applied_rule_id.in_(
+                    select(RewardRule.id).where(RewardRule.cap_bucket_id == bucket_id)
+                ),
+            )
         )
 
-        result = self.session.exec(statement).first()
-        return result if result else 0.0
+        result = self.session.execute(statement).scalar()
+        self._usage_cache[key] = usage = result if result else 0.0
+        return usage
+
+    def invalidate_usage(self) -> None:
+        """
+        Forget cached cap usage sums. Call after committing expenses if the
+        same engine keeps calculating rewards afterwards.
+        """
+        self._usage_cache.clear()
 
     def _get_period_dates(
         self, period: PeriodType, anchor: int, ref_date: datetime
@@ -2,7 +2,7 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 # --- 0. Enums for Logic & Time ---
@@ -179,6 +179,9 @@ class RedemptionPartner(SQLModel, table=True):
 class Expense(SQLModel, table=True):
     """Represents a single financial transaction."""
 
+    # Cap usage sums filter one card's expenses by date range
+    __table_args__ = (Index("ix_expense_card_id_date", "card_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     amount: float
     merchant: str
@@ -190,9 +193,9 @@ class Expense(SQLModel, table=True):
     points_earned: float = 0.0
 
     # Useful to know WHICH rule triggered this reward (for debugging)
-    applied_rule_id: Optional[int] = Field(default=None)
+    applied_rule_id: Optional[int] = Field(default=None, index=True)
 
-    date: datetime = Field(default_factory=datetime.now)
+    date: datetime = Field(default_factory=datetime.now, index=True)
 
     card_id: Optional[int] = Field(default=None, foreign_key="creditcard.id")
     card: Optional[CreditCard] = Relationship(back_populates="expenses")